@@ -0,0 +1,201 @@
+"""
+Базовий клас для класів Vkursi API: токен авторизації та повтор запиту після 401
+"""
+import hashlib
+import logging
+import requests
+from typing import Optional, Dict, Any
+import json_utils
+from config import get_config
+from auth import VkursiAuth, get_auth
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def response_has_data(response_data: Any) -> bool:
+    """
+    Перевірити чи відповідь API містить дані, які варто кешувати
+    
+    Відповіді з success: false, повідомленням про помилку або порожнім полем
+    data не кешуються, щоб помилку не повторювати з кешу.
+    
+    Args:
+        response_data: Розпарсена відповідь API
+        
+    Returns:
+        True якщо відповідь містить дані
+    """
+    if isinstance(response_data, list):
+        return bool(response_data)
+    if not isinstance(response_data, dict) or not response_data:
+        return False
+    if response_data.get("success", response_data.get("Success")) is False:
+        return False
+    if response_data.get("errorMessage") or response_data.get("ErrorMessage"):
+        return False
+    for data_key in ("data", "Data"):
+        if data_key in response_data and not response_data[data_key]:
+            return False
+    return True
+
+
+class VkursiAPIClient:
+    """Базовий клас для класів API: спільна HTTP сесія, токен та повтор запиту після 401"""
+    
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None,
+                 auth: Optional[VkursiAuth] = None):
+        """
+        Ініціалізація клієнта API
+        
+        Args:
+            token: Токен авторизації (якщо None, береться з .env або виконується авторизація)
+            session: HTTP сесія (якщо None, використовується спільна сесія процесу)
+            auth: Об'єкт авторизації (якщо None, використовується спільний get_auth())
+        """
+        self.config = get_config()
+        self.base_url = self.config.BASE_URL
+        if auth is None:
+            auth = VkursiAuth(session=session) if session is not None else get_auth()
+        self.auth = auth
+        # Використовуємо один пул з'єднань для авторизації та запитів до API
+        self.session = self.auth.session
+        
+        # Отримуємо токен (заголовок Authorization додається до кожного запиту)
+        self._set_token(token or self.auth.get_token())
+    
+    def _set_token(self, token: Optional[str]):
+        """
+        Встановити токен авторизації для запитів цього об'єкта
+        
+        Args:
+            token: Токен авторизації
+        """
+        self.token = token
+        # Заголовок формуємо один раз для всіх запитів з цим токеном
+        self._auth_header = {"Authorization": f"Bearer {token}"} if token else {}
+    
+    def _cache_key(self, key: str) -> str:
+        """
+        Сформувати ключ запису кешу для облікового запису з .env
+        
+        Відповіді API залежать від прав облікового запису, тому записи різних
+        облікових записів у спільному файлі кешу не перетинаються. Email у
+        ключ не записується, лише його хеш.
+        
+        Args:
+            key: Ключ запиту (метод та параметри)
+            
+        Returns:
+            Ключ запису кешу
+        """
+        email, _ = self.config.get_credentials()
+        account = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+        return f"{account}:{key}"
+    
+    def _auth_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Доповнити заголовки запиту заголовком Authorization з токеном цього об'єкта
+        
+        Заголовок не записується в сесію: вона спільна для процесу, тож інші
+        об'єкти API з власними токенами та запит авторизації його не отримують.
+        
+        Args:
+            headers: Додаткові заголовки запиту
+            
+        Returns:
+            Словник заголовків (без додаткових - спільний, його не змінюють)
+        """
+        if not headers:
+            return self._auth_header
+        return {**headers, **self._auth_header}
+    
+    def _ensure_token(self) -> bool:
+        """
+        Переконатися, що є токен, дія якого не закінчиться найближчим часом
+        
+        Термін дії JWT перевіряється локально (поле exp), тому токен оновлюється
+        перед запитом, а не після відповіді 401.
+        
+        Returns:
+            True якщо токен є
+        """
+        if self.token and self.auth.is_token_valid(self.token):
+            return True
+        
+        if self.token:
+            log.info("Термін дії токену закінчується. Отримую новий токен...")
+            return self.refresh_token()
+        
+        log.info("Токен не знайдено. Виконую авторизацію...")
+        self._set_token(self.auth.authorize(persist=False))
+        return bool(self.token)
+    
+    def refresh_token(self) -> bool:
+        """
+        Оновити токен авторизації
+        
+        Returns:
+            True якщо токен успішно оновлено
+        """
+        # Якщо інший потік вже оновив токен, беремо його без повторної авторизації
+        new_token = self.auth.get_token(force_refresh=True, stale_token=self.token)
+        if new_token:
+            self._set_token(new_token)
+            return True
+        return False
+    
+    def _request_with_reauth(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Виконати запит до API; при відповіді 401 оновити токен і повторити запит один раз
+        
+        Повторні спроби при 429 та 5xx виконує адаптер сесії (urllib3 Retry).
+        
+        Args:
+            method: HTTP метод
+            url: Адреса запиту
+            **kwargs: Параметри для requests.Session.request
+            
+        Returns:
+            Об'єкт відповіді requests
+        """
+        kwargs.setdefault("timeout", self.config.REQUEST_TIMEOUT)
+        headers = kwargs.pop("headers", None)
+        response = self.session.request(method, url, headers=self._auth_headers(headers), **kwargs)
+        
+        if response.status_code == 401:
+            log.info("Токен недійсний або закінчився термін дії. Отримую новий токен...")
+            if not self.refresh_token():
+                log.error("Помилка авторизації: не вдалося оновити токен, запит не повторено")
+                return response
+            response.close()
+            response = self.session.request(method, url, headers=self._auth_headers(headers),
+                                            **kwargs)
+            if response.status_code == 401:
+                log.error("Помилка авторизації: токен недійсний навіть після оновлення")
+        
+        return response
+    
+    def _handle_response(self, response: requests.Response) -> Optional[Dict[str, Any]]:
+        """
+        Обробити відповідь API
+        
+        Args:
+            response: Об'єкт відповіді requests
+            
+        Returns:
+            Словник з даними або None у разі помилки
+        """
+        if response.status_code == 401:
+            # Причину (не вдалося оновити токен або новий токен теж відхилено)
+            # вже повідомлено в _request_with_reauth
+            return None
+        elif response.status_code == 200:
+            try:
+                return json_utils.loads(response.content)
+            except ValueError:
+                log.error("Помилка: не вдалося розпарсити JSON відповідь")
+                return None
+        else:
+            log.error("Помилка API: %s. Відповідь: %s", response.status_code, response.text)
+            return None
@@ -1,28 +1,101 @@
 """
 Модуль для авторизації та отримання токену Vkursi API
 """
+import asyncio
+import base64
 import requests
 import json
-from typing import Optional
-from config import Config
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
+import json_utils
+from config import get_config
+from http_session import get_session
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+# Кеш токенів у пам'яті процесу: email -> (токен, момент закінчення дії за time.monotonic())
+_TOKEN_CACHE: Dict[str, Tuple[str, float]] = {}
+# Термін дії токену, якщо його не вдалося визначити з JWT (30 хвилин)
+_TOKEN_LIFETIME = 30 * 60
+# Запас часу до закінчення дії токену, після якого токен вважається застарілим
+_TOKEN_EXPIRY_MARGIN = 2 * 60
+# Блокування, щоб при одночасних запитах авторизацію виконував лише один потік
+_refresh_lock = threading.RLock()
+# Скільки секунд дії має залишатися у токена, щоб is_token_valid вважав його дійсним
+_TOKEN_MIN_REMAINING = 60
+# Мінімальний інтервал між записами токену в .env файл (секунди)
+_PERSIST_INTERVAL = 5 * 60
+# Момент останнього запису токену в .env (за time.monotonic())
+_last_persist: Optional[float] = None
+
+
+@lru_cache(maxsize=4)
+def _jwt_exp(token: str) -> Optional[float]:
+    """
+    Отримати час закінчення дії токену з поля exp JWT (результат кешується для кожного токену)
+    
+    Args:
+        token: Токен авторизації
+        
+    Returns:
+        Unix час закінчення дії або None, якщо токен не є JWT
+    """
+    try:
+        payload_b64 = token.split(".")[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload_b64)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _token_deadline(token: str) -> float:
+    """
+    Обчислити момент (за time.monotonic()), до якого токен можна брати з кешу
+    
+    Args:
+        token: Токен авторизації
+        
+    Returns:
+        Момент закінчення дії кешованого токену
+    """
+    exp = _jwt_exp(token)
+    lifetime = exp - time.time() if exp is not None else _TOKEN_LIFETIME
+    return time.monotonic() + lifetime - _TOKEN_EXPIRY_MARGIN
 
 
 class VkursiAuth:
     """Клас для авторизації в Vkursi API"""
     
-    def __init__(self):
-        """Ініціалізація класу авторизації"""
-        self.config = Config()
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Ініціалізація класу авторизації
+        
+        Args:
+            session: HTTP сесія (якщо None, використовується спільна сесія процесу)
+        """
+        self.config = get_config()
         self.base_url = self.config.BASE_URL
         self.auth_endpoint = f"{self.base_url}/api/1.0/token/authorize"
+        
+        # Сесія з пулом з'єднань, спільна з класами API
+        self.session = session if session is not None else get_session()
     
-    def authorize(self, email: Optional[str] = None, password: Optional[str] = None) -> Optional[str]:
+    def authorize(self, email: Optional[str] = None, password: Optional[str] = None,
+                  persist: bool = True) -> Optional[str]:
         """
         Авторизація та отримання токену
         
         Args:
             email: Email користувача (якщо None, береться з .env)
             password: Пароль користувача (якщо None, береться з .env)
+            persist: Зберегти токен в .env файл (не частіше ніж раз на 5 хвилин).
+                Автоматичне оновлення токену передає False - токен лишається в кеші
             
         Returns:
             Токен авторизації або None у разі помилки
@@ -30,6 +103,8 @@ class VkursiAuth:
         Note:
             Термін дії токену 30 хвилин
         """
+        global _last_persist
+        
         # Отримуємо облікові дані з параметрів або .env
         if email is None or password is None:
             env_email, env_password = self.config.get_credentials()
@@ -37,8 +112,8 @@ class VkursiAuth:
             password = password or env_password
         
         if not email or not password:
-            print("Помилка: не вказано email або password")
-            print("Вкажіть облікові дані в .env файлі або передайте їх як параметри")
+            log.error("Помилка: не вказано email або password. "
+                      "Вкажіть облікові дані в .env файлі або передайте їх як параметри")
             return None
         
         # Формуємо тіло запиту
@@ -47,73 +122,110 @@ class VkursiAuth:
             "password": password
         }
         
-        # Заголовки запиту
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        try:
-            # Виконуємо POST запит
-            response = requests.post(
-                self.auth_endpoint,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            # Перевіряємо статус відповіді
-            if response.status_code == 200:
-                response_data = response.json()
-                # Шукаємо токен в різних форматах (Token, token)
-                token = response_data.get("Token") or response_data.get("token")
+        # Одночасно авторизацію та збереження токену виконує лише один потік
+        with _refresh_lock:
+            try:
+                # Виконуємо POST запит (Content-Type задано в сесії)
+                response = self.session.post(
+                    self.auth_endpoint,
+                    json=payload,
+                    timeout=self.config.REQUEST_TIMEOUT
+                )
                 
-                if token:
-                    # Зберігаємо токен в .env файл
-                    if self.config.save_token(token):
-                        print("Токен успішно отримано та збережено в .env файл")
-                    else:
-                        print("Токен отримано, але не вдалося зберегти в .env файл")
+                # Перевіряємо статус відповіді
+                if response.status_code == 200:
+                    response_data = json_utils.loads(response.content)
+                    # Шукаємо токен в різних форматах (Token, token)
+                    token = response_data.get("Token") or response_data.get("token")
                     
-                    return token
+                    if token:
+                        # Кешуємо токен у пам'яті до закінчення терміну дії
+                        _TOKEN_CACHE[email] = (token, _token_deadline(token))
+                        
+                        # Зберігаємо токен в .env файл
+                        now = time.monotonic()
+                        if persist and (_last_persist is None or now - _last_persist > _PERSIST_INTERVAL):
+                            if self.config.save_token(token):
+                                _last_persist = now
+                                log.info("Токен успішно отримано та збережено в .env файл")
+                            else:
+                                log.warning("Токен отримано, але не вдалося зберегти в .env файл")
+                        else:
+                            log.info("Токен успішно отримано")
+                        
+                        return token
+                    else:
+                        log.error("Помилка: токен не знайдено в відповіді API. Структура відповіді: %s",
+                                  response_data)
+                        return None
                 else:
-                    print("Помилка: токен не знайдено в відповіді API")
-                    print(f"Структура відповіді: {response_data}")
-                    print(f"Повна відповідь: {response.text}")
+                    log.error("Помилка авторизації: %s. Відповідь: %s",
+                              response.status_code, response.text)
                     return None
-            else:
-                print(f"Помилка авторизації: {response.status_code}")
-                print(f"Відповідь: {response.text}")
+                    
+            except requests.exceptions.RequestException as e:
+                log.error("Помилка під час виконання запиту: %s", e)
+                return None
+            except json.JSONDecodeError as e:
+                log.error("Помилка парсингу JSON відповіді: %s", e)
                 return None
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Помилка під час виконання запиту: {e}")
-            return None
-        except json.JSONDecodeError as e:
-            print(f"Помилка парсингу JSON відповіді: {e}")
-            return None
     
-    def get_token(self, force_refresh: bool = False) -> Optional[str]:
+    def get_token(self, force_refresh: bool = False,
+                  stale_token: Optional[str] = None,
+                  persist: bool = False) -> Optional[str]:
         """
-        Отримати токен з .env або виконати авторизацію
+        Отримати токен з кешу, .env або виконати авторизацію
         
         Args:
             force_refresh: Якщо True, виконує нову авторизацію навіть якщо токен є
+            stale_token: Токен, який виявився недійсним. Якщо інший потік вже
+                отримав новий токен, повертається він без повторної авторизації
+            persist: Зберегти новий токен в .env файл
             
         Returns:
             Токен авторизації або None
         """
-        # Якщо не потрібно оновлювати, спробуємо отримати з .env
-        if not force_refresh:
-            token = self.config.get_token()
-            if token:
-                return token
+        with _refresh_lock:
+            email, _ = self.config.get_credentials()
+            cached = _TOKEN_CACHE.get(email)
+            if cached and cached[1] > time.monotonic():
+                if not force_refresh or (stale_token is not None and cached[0] != stale_token):
+                    return cached[0]
+            
+            # Якщо не потрібно оновлювати, спробуємо отримати з .env (лише ще дійсний токен:
+            # оновлені токени в .env не записуються, тож там часто лежить застарілий)
+            if not force_refresh:
+                token = self.config.get_token()
+                if token and self.is_token_valid(token):
+                    return token
+            
+            # Виконуємо авторизацію
+            return self.authorize(persist=persist)
+    
+    async def get_token_async(self, force_refresh: bool = False,
+                              stale_token: Optional[str] = None) -> Optional[str]:
+        """
+        Асинхронний варіант get_token для asyncio
+        
+        Авторизація виконується в окремому потоці, тому цикл подій не блокується,
+        а одночасні оновлення токену об'єднуються тим самим блокуванням.
         
-        # Виконуємо авторизацію
-        return self.authorize()
+        Args:
+            force_refresh: Якщо True, виконує нову авторизацію навіть якщо токен є
+            stale_token: Токен, який виявився недійсним
+            
+        Returns:
+            Токен авторизації або None
+        """
+        return await asyncio.to_thread(self.get_token, force_refresh, stale_token)
     
     def is_token_valid(self, token: Optional[str] = None) -> bool:
         """
-        Перевірити чи токен дійсний (опціонально, можна використати для перевірки)
+        Перевірити чи токен дійсний без запиту до API
+        
+        Для JWT перевіряється поле exp: токен дійсний, якщо до закінчення
+        його дії залишилось більше хвилини. Для інших токенів перевіряється
+        лише наявність токену.
         
         Args:
             token: Токен для перевірки (якщо None, береться з .env)
@@ -127,6 +239,33 @@ class VkursiAuth:
         if not token:
             return False
         
-        # Можна додати перевірку через API endpoint
-        # Поки що просто перевіряємо наявність токену
-        return len(token) > 0
+        exp = _jwt_exp(token)
+        if exp is None:
+            return len(token) > 0
+        return exp - time.time() > _TOKEN_MIN_REMAINING
+
+
+@lru_cache(maxsize=None)
+def get_auth() -> VkursiAuth:
+    """
+    Отримати спільний об'єкт авторизації
+    
+    Класи API використовують його за замовчуванням, тому кеш токену та
+    спільна HTTP сесія не створюються повторно для кожного об'єкта API
+    
+    Returns:
+        Об'єкт VkursiAuth
+    """
+    return VkursiAuth()
+
+
+if __name__ == "__main__":
+    # python -m auth login - авторизація зі збереженням токену в .env файл
+    import sys
+    
+    if sys.argv[1:] != ["login"]:
+        print("Використання: python -m auth login")
+        sys.exit(2)
+    
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(0 if VkursiAuth().authorize(persist=True) else 1)
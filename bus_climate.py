@@ -1,76 +1,105 @@
 """
 Модуль для роботи з API бізнес-клімату (Hromada getclimate)
 """
+import logging
+import os
 import requests
-import json
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
-from config import Config
+from typing import Optional, Dict, Any, List
+import json_utils
+from api_client import VkursiAPIClient, response_has_data
 from auth import VkursiAuth
+from response_cache import ResponseCache, max_age_from_headers
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
 
-class HromadaAPI:
+
+# Статуси, якими API однозначно відхиляє пакетний запит (список років не підтримується).
+# Інші помилки (мережа, 5xx, 429) тимчасові і пакетний режим не вимикають
+BATCH_REJECTED_STATUSES = frozenset((400, 404, 405, 422))
+
+
+def split_climate_batch(response_data: Any, years: List[int]) -> Optional[Dict[int, Any]]:
+    """
+    Розбити відповідь пакетного запиту getclimate на дані окремих років
+    
+    Приймається лише відповідь, де рік кожної частини можна перевірити: словник
+    з ключами-роками або список записів з полем year. Список без років не
+    розбирається за порядком - API, що ігнорує список років, повертає звичайні
+    дані, довжина яких може випадково збігтися з кількістю років.
+    
+    Args:
+        response_data: Розпарсена відповідь API
+        years: Роки, передані в запиті
+        
+    Returns:
+        Словник {рік: дані} або None, якщо відповідь не містить дані кожного року
+    """
+    if isinstance(response_data, dict):
+        if all(str(year) in response_data for year in years):
+            return {year: response_data[str(year)] for year in years}
+        return None
+    
+    if not isinstance(response_data, list):
+        return None
+    
+    by_year: Dict[int, Any] = {}
+    for item in response_data:
+        if not isinstance(item, dict):
+            return None
+        item_year = item.get("year", item.get("Year"))
+        # Рік має бути цілим числом і не повторюватися
+        if type(item_year) is not int or item_year in by_year:
+            return None
+        by_year[item_year] = item
+    
+    if all(year in by_year for year in years):
+        return {year: by_year[year] for year in years}
+    return None
+
+
+class HromadaAPI(VkursiAPIClient):
     """Клас для роботи з API Hromada"""
     
-    def __init__(self, token: Optional[str] = None):
+    # Термін актуальності кешу, якщо API не повідомляє його в Cache-Control (секунди)
+    PAST_YEAR_CACHE_TTL = 24 * 60 * 60
+    CURRENT_YEAR_CACHE_TTL = 60 * 60
+    # Найраніший календарний рік даних; менші значення (наприклад year=1 за
+    # замовчуванням) не є минулими роками і кешуються як поточний
+    FIRST_DATA_YEAR = 1991
+    
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None,
+                 use_cache: bool = True, output_dir: str = "output",
+                 auth: Optional[VkursiAuth] = None):
         """
         Ініціалізація класу Hromada API
         
         Args:
             token: Токен авторизації (якщо None, береться з .env або виконується авторизація)
+            session: HTTP сесія (якщо None, використовується спільна сесія процесу)
+            use_cache: Кешувати відповіді getclimate на диску (<output_dir>/.climate_cache)
+            output_dir: Директорія для збереження файлів (за замовчуванням "output")
+            auth: Об'єкт авторизації (якщо None, використовується спільний get_auth())
         """
-        self.config = Config()
-        self.base_url = self.config.BASE_URL
-        self.auth = VkursiAuth()
+        super().__init__(token, session, auth)
         
-        # Отримуємо токен
-        if token:
-            self.token = token
-        else:
-            self.token = self.auth.get_token()
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """
-        Отримати заголовки для API запитів
+        # Endpoint формуємо один раз
+        self._climate_endpoint = f"{self.base_url}/api/1.0/Hromada/getclimate"
         
-        Returns:
-            Словник з заголовками
-        """
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.token}"
-        }
-    
-    def _handle_response(self, response: requests.Response) -> Optional[Dict[str, Any]]:
-        """
-        Обробити відповідь API
+        # Чи приймає API список років в одному запиті (None - ще не перевірено)
+        self._batch_supported: Optional[bool] = None
         
-        Args:
-            response: Об'єкт відповіді requests
-            
-        Returns:
-            Словник з даними або None у разі помилки
-        """
-        if response.status_code == 401:
-            print("Токен недійсний або закінчився термін дії. Отримую новий токен...")
-            # Отримуємо новий токен
-            new_token = self.auth.authorize()
-            if new_token:
-                self.token = new_token
-                # Можна повторити запит, але поки що просто повертаємо None
-                print("Отримано новий токен. Повторіть запит.")
-            return None
-        elif response.status_code == 200:
-            try:
-                return response.json()
-            except ValueError:
-                print("Помилка: не вдалося розпарсити JSON відповідь")
-                return None
-        else:
-            print(f"Помилка API: {response.status_code}")
-            print(f"Відповідь: {response.text}")
-            return None
+        # Директорію для файлів створюємо один раз, а не при кожному збереженні
+        self._output_path = Path(output_dir)
+        self._output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Кеш відповідей з ETag для умовних запитів
+        self.cache = ResponseCache(self._output_path / ".climate_cache") if use_cache else None
     
     def get_climate(self, year: int = 1) -> Optional[Dict[str, Any]]:
         """
@@ -86,94 +115,365 @@ class HromadaAPI:
             >>> api = HromadaAPI()
             >>> data = api.get_climate(year=2023)
         """
-        endpoint = f"{self.base_url}/api/1.0/Hromada/getclimate"
+        # Якщо відповідь є в кеші і ще актуальна, запит (і токен) не потрібен
+        cache_key = self._cache_key(f"getclimate:{year}")
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached and ResponseCache.is_fresh(cached):
+            return json_utils.loads(cached["content"])
         
-        # Перевіряємо наявність токену
-        if not self.token:
-            print("Токен не знайдено. Виконую авторизацію...")
-            self.token = self.auth.authorize()
-            if not self.token:
-                print("Помилка: не вдалося отримати токен")
-                return None
+        # Перевіряємо наявність токену та оновлюємо його до закінчення терміну дії
+        if not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return None
         
         # Формуємо тіло запиту
         payload = {
             "year": year
         }
         
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        
         try:
             # Виконуємо POST запит
-            response = requests.post(
-                endpoint,
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30
+            response = self._request_with_reauth(
+                "POST",
+                self._climate_endpoint,
+                headers=headers,
+                json=payload
             )
             
-            return self._handle_response(response)
+            # 304 Not Modified - дані не змінилися, беремо їх з кешу
+            if response.status_code == 304 and cached:
+                self.cache.touch(cache_key, self._climate_cache_ttl(year, response))
+                return json_utils.loads(cached["content"])
+            
+            climate_data = self._handle_response(response)
+            # Відповіді без даних (success: false, errorMessage) не кешуються
+            if self.cache and response_has_data(climate_data):
+                self.cache.set(
+                    cache_key,
+                    response.content,
+                    etag=response.headers.get("ETag"),
+                    max_age=self._climate_cache_ttl(year, response)
+                )
+            return climate_data
             
         except requests.exceptions.RequestException as e:
-            print(f"Помилка під час виконання запиту: {e}")
+            log.error("Помилка під час виконання запиту: %s", e)
             return None
     
-    def refresh_token(self) -> bool:
+    def _climate_cache_ttl(self, year: int, response: requests.Response) -> int:
         """
-        Оновити токен авторизації
+        Визначити термін актуальності кешованих даних бізнес-клімату
         
+        Args:
+            year: Рік даних
+            response: Відповідь API
+            
         Returns:
-            True якщо токен успішно оновлено
+            Кількість секунд (з Cache-Control або 24 год для минулих років і 1 год для поточного)
         """
-        new_token = self.auth.authorize()
-        if new_token:
-            self.token = new_token
-            return True
-        return False
+        max_age = max_age_from_headers(response.headers)
+        if max_age is not None:
+            return max_age
+        if self.FIRST_DATA_YEAR <= year < time.localtime().tm_year:
+            return self.PAST_YEAR_CACHE_TTL
+        return self.CURRENT_YEAR_CACHE_TTL
+    
+    def get_climate_batch(self, years: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Отримати дані бізнес-клімату за кілька років
+        
+        Роки з актуальними даними в кеші беруться з нього. Для решти спочатку
+        надсилається один запит зі списком років, отримані дані кешуються так
+        само, як у get_climate. Якщо пакетний запит не вдався, дані
+        отримуються через get_climate для кожного року. Надалі пакетний запит
+        не пробується лише тоді, коли API однозначно його не підтримує
+        (статус з BATCH_REJECTED_STATUSES або відповідь без даних за роками).
+        
+        Args:
+            years: Список років
+            
+        Returns:
+            Словник {рік: дані бізнес-клімату або None}
+            
+        Example:
+            >>> api = HromadaAPI()
+            >>> data = api.get_climate_batch([2021, 2022, 2023])
+        """
+        results: Dict[int, Optional[Dict[str, Any]]] = {}
+        missing = []
+        for year in dict.fromkeys(years):
+            cached = self._get_fresh_cached(year)
+            if cached is not None:
+                results[year] = cached
+            else:
+                missing.append(year)
+        
+        if missing and self._batch_supported is not False:
+            batch_data = self._post_climate_batch(missing)
+            if batch_data is not None:
+                self._batch_supported = True
+                results.update(batch_data)
+                missing = []
+            elif self._batch_supported is False:
+                log.info("API не підтримує пакетний запит. Отримую дані окремо для кожного року...")
+            else:
+                log.info("Пакетний запит не вдався. Отримую дані окремо для кожного року...")
+        
+        for year in missing:
+            results[year] = self.get_climate(year=year)
+        
+        return {year: results[year] for year in years}
+    
+    def _get_fresh_cached(self, year: int) -> Optional[Dict[str, Any]]:
+        """
+        Отримати дані бізнес-клімату з кешу, якщо вони ще актуальні
+        
+        Args:
+            year: Рік даних
+            
+        Returns:
+            Словник з даними або None, якщо актуального запису немає
+        """
+        if not self.cache:
+            return None
+        cached = self.cache.get(self._cache_key(f"getclimate:{year}"))
+        if cached and ResponseCache.is_fresh(cached):
+            return json_utils.loads(cached["content"])
+        return None
+    
+    def _post_climate_batch(self, years: List[int]) -> Optional[Dict[int, Any]]:
+        """
+        Виконати один запит getclimate зі списком років
+        
+        Якщо API однозначно відхилило запит, встановлює _batch_supported = False.
+        
+        Args:
+            years: Список років
+            
+        Returns:
+            Словник {рік: дані} або None, якщо API не повернуло дані для кожного року
+        """
+        if not self._ensure_token():
+            return None
+        
+        try:
+            response = self._request_with_reauth(
+                "POST",
+                self._climate_endpoint,
+                json={"years": years}
+            )
+        except requests.exceptions.RequestException:
+            return None
+        
+        if response.status_code != 200:
+            if response.status_code in BATCH_REJECTED_STATUSES:
+                self._batch_supported = False
+            return None
+        
+        try:
+            response_data = json_utils.loads(response.content)
+        except ValueError:
+            # Неповна або пошкоджена відповідь - тимчасова помилка
+            return None
+        
+        # Розбиваємо відповідь на дані окремих років
+        batch_data = split_climate_batch(response_data, years)
+        if batch_data is None:
+            # API відповіло, але не даними за роками - список років не підтримується
+            self._batch_supported = False
+        elif self.cache:
+            for year, climate_data in batch_data.items():
+                if response_has_data(climate_data):
+                    self.cache.set(
+                        self._cache_key(f"getclimate:{year}"),
+                        json_utils.dumps(climate_data, pretty=False),
+                        max_age=self._climate_cache_ttl(year, response)
+                    )
+        return batch_data
     
     def save_climate_to_file(self, climate_data: Dict[str, Any], year: int, 
-                            output_dir: str = "output") -> Optional[str]:
+                            output_dir: Optional[str] = None,
+                            compress: bool = False) -> Optional[str]:
         """
         Зберегти дані бізнес-клімату у структурований JSON файл
         
         Args:
             climate_data: Дані бізнес-клімату для збереження
             year: Рік даних
-            output_dir: Директорія для збереження файлів (за замовчуванням "output")
+            output_dir: Інша директорія для збереження (за замовчуванням - вказана при створенні)
+            compress: Стиснути файл gzip (розширення .json.gz)
             
         Returns:
             Шлях до збереженого файлу або None у разі помилки
         """
         if not climate_data:
-            print("Помилка: немає даних для збереження")
+            log.error("Помилка: немає даних для збереження")
             return None
         
         try:
-            # Створюємо директорію якщо вона не існує
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
+            output_path = self._resolve_output_path(output_dir)
             
             # Формуємо ім'я файлу з датою та роком
-            current_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"climate_year_{year}_{current_date}.json"
+            # Один момент часу для імені файлу та метаданих
+            now = datetime.now().astimezone()
+            current_date = now.strftime("%Y-%m-%d_%H-%M-%S")
+            filename = f"climate_year_{year}_{current_date}.json" + (".gz" if compress else "")
             filepath = output_path / filename
             
             # Створюємо структурований JSON з метаданими
             structured_data = {
-                "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "date_created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "year": year,
-                    "description": f"Дані бізнес-клімату за {year} рік. Файл створено {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                },
+                "metadata": self._climate_metadata(year, now),
                 "data": climate_data
             }
             
             # Зберігаємо у JSON файл з красивим форматуванням
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, ensure_ascii=False, indent=2)
+            json_utils.dump_to_file(structured_data, filepath, compress=compress)
             
-            print(f"Дані збережено у файл: {filepath}")
+            log.info("Дані збережено у файл: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            print(f"Помилка збереження файлу: {e}")
-            return None
\ No newline at end of file
+            log.error("Помилка збереження файлу: %s", e)
+            return None
+    
+    def save_climate_many(self, results: Dict[int, Optional[Dict[str, Any]]],
+                          output_dir: Optional[str] = None,
+                          max_workers: int = 4, compress: bool = False) -> Dict[int, Optional[str]]:
+        """
+        Зберегти дані бізнес-клімату за кілька років паралельно
+        
+        Серіалізація та запис файлів виконуються в пулі потоків. Імена файлів
+        містять рік, тому потоки не пишуть в один файл.
+        
+        Args:
+            results: Словник {рік: дані}, наприклад результат get_climate_batch
+            output_dir: Інша директорія для збереження (за замовчуванням - вказана при створенні)
+            max_workers: Кількість потоків для запису
+            compress: Стиснути файли gzip (розширення .json.gz)
+            
+        Returns:
+            Словник {рік: шлях до файлу або None}
+            
+        Example:
+            >>> api = HromadaAPI()
+            >>> api.save_climate_many(api.get_climate_batch([2022, 2023]))
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                year: executor.submit(self.save_climate_to_file, data, year, output_dir, compress)
+                for year, data in results.items()
+            }
+        return {year: future.result() for year, future in futures.items()}
+    
+    def _resolve_output_path(self, output_dir: Optional[str]) -> Path:
+        """
+        Отримати директорію для збереження файлу
+        
+        Args:
+            output_dir: Директорія, вказана у виклику, або None
+            
+        Returns:
+            Шлях до існуючої директорії
+        """
+        if output_dir is None:
+            return self._output_path
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        return output_path
+    
+    def _climate_metadata(self, year: int, now: datetime) -> Dict[str, Any]:
+        """
+        Сформувати метадані для файлу з даними бізнес-клімату
+        
+        Args:
+            year: Рік даних
+            now: Час створення файлу (з часовим поясом)
+            
+        Returns:
+            Словник з метаданими
+        """
+        date_created = now.strftime("%Y-%m-%d %H:%M:%S")
+        return {
+            "created_at": now.isoformat(),
+            "date_created": date_created,
+            "year": year,
+            "description": f"Дані бізнес-клімату за {year} рік. Файл створено {date_created}"
+        }
+    
+    def download_climate_to_file(self, year: int, output_dir: Optional[str] = None,
+                                 compress: bool = False) -> Optional[str]:
+        """
+        Отримати дані бізнес-клімату та записати відповідь API напряму у файл
+        
+        Тіло відповіді копіюється у файл потоком без розбору JSON у словник
+        та повторної серіалізації, тому підходить для великих відповідей.
+        Обгортка з метаданими збігається байт у байт з save_climate_to_file,
+        поле data містить тіло відповіді без переформатування. Файл спершу
+        пишеться у .tmp і перейменовується лише після повного запису, тому
+        обірване завантаження не залишає неповного файлу.
+        
+        Args:
+            year: Рік для отримання даних
+            output_dir: Інша директорія для збереження (за замовчуванням - вказана при створенні)
+            compress: Стиснути файл gzip (розширення .json.gz)
+            
+        Returns:
+            Шлях до збереженого файлу або None у разі помилки
+        """
+        # Перевіряємо наявність токену та оновлюємо його до закінчення терміну дії
+        if not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return None
+        
+        try:
+            response = self._request_with_reauth(
+                "POST",
+                self._climate_endpoint,
+                json={"year": year},
+                stream=True
+            )
+        except requests.exceptions.RequestException as e:
+            log.error("Помилка під час виконання запиту: %s", e)
+            return None
+        
+        with response:
+            if response.status_code != 200:
+                self._handle_response(response)
+                return None
+            
+            tmp_path = None
+            try:
+                output_path = self._resolve_output_path(output_dir)
+                
+                now = datetime.now().astimezone()
+                current_date = now.strftime("%Y-%m-%d_%H-%M-%S")
+                filepath = output_path / f"climate_year_{year}_{current_date}.json"
+                if compress:
+                    filepath = filepath.with_name(filepath.name + ".gz")
+                
+                # Метадані форматуємо як у save_climate_to_file, тіло відповіді пишемо як є
+                metadata = json_utils.dumps(self._climate_metadata(year, now))
+                header = b'{\n  "metadata": ' + metadata.replace(b"\n", b"\n  ") + b',\n  "data": '
+                
+                # Розпаковуємо gzip/deflate при копіюванні сирого потоку
+                response.raw.decode_content = True
+                tmp_path = filepath.with_name(filepath.name + ".tmp")
+                with json_utils.open_for_write(tmp_path, compress) as f:
+                    f.write(header)
+                    shutil.copyfileobj(response.raw, f)
+                    f.write(b'\n}')
+                os.replace(tmp_path, filepath)
+                
+                log.info("Дані збережено у файл: %s", filepath)
+                return str(filepath)
+                
+            except Exception as e:
+                # Обрив потоку (помилки urllib3) або запису - прибираємо неповний файл
+                if tmp_path is not None:
+                    tmp_path.unlink(missing_ok=True)
+                log.error("Помилка збереження файлу: %s", e)
+                return None
@@ -0,0 +1,335 @@
+"""
+Модуль для паралельного отримання даних бізнес-клімату за кілька років (asyncio + aiohttp)
+"""
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+from config import Config
+from auth import VkursiAuth
+from bus_climate import BATCH_REJECTED_STATUSES, split_climate_batch
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+CLIMATE_ENDPOINT = f"{Config.BASE_URL}/api/1.0/Hromada/getclimate"
+
+
+async def _refresh_session_token(session: "aiohttp.ClientSession", auth: VkursiAuth,
+                                 stale_header: str) -> bool:
+    """
+    Оновити токен після відповіді 401 і замінити заголовок Authorization сесії
+    
+    Args:
+        session: Сесія aiohttp із заголовком авторизації
+        auth: Об'єкт авторизації
+        stale_header: Заголовок Authorization, з яким запит отримав 401
+    
+    Returns:
+        True якщо заголовок сесії містить новий токен
+    """
+    # Інший запит вже замінив токен у сесії
+    if session.headers.get("Authorization") != stale_header:
+        return True
+    # Якщо інший потік вже оновив токен, get_token поверне його без повторної авторизації
+    token = await auth.get_token_async(force_refresh=True,
+                                       stale_token=stale_header.removeprefix("Bearer "))
+    if not token:
+        return False
+    session.headers["Authorization"] = f"Bearer {token}"
+    return True
+
+
+async def get_climate(session: "aiohttp.ClientSession", year: int,
+                      auth: Optional[VkursiAuth] = None) -> Optional[Dict[str, Any]]:
+    """
+    Отримати дані бізнес-клімату за один рік
+    
+    Args:
+        session: Сесія aiohttp із заголовком авторизації
+        year: Рік для отримання даних
+        auth: Об'єкт авторизації для оновлення токену після відповіді 401
+            (якщо None, запит не повторюється)
+    
+    Returns:
+        Словник з даними бізнес-клімату або None у разі помилки
+    """
+    for attempt in (1, 2):
+        sent_header = session.headers.get("Authorization", "")
+        try:
+            async with session.post(CLIMATE_ENDPOINT, json={"year": year}) as response:
+                if response.status == 200:
+                    try:
+                        return await response.json(content_type=None)
+                    except ValueError:
+                        log.error("Помилка: не вдалося розпарсити JSON відповідь (рік %s)", year)
+                        return None
+                
+                if response.status != 401 or auth is None or attempt == 2:
+                    log.error("Помилка API для року %s: %s. Відповідь: %s",
+                              year, response.status, await response.text())
+                    return None
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.error("Помилка під час виконання запиту (рік %s): %s", year, e)
+            return None
+        
+        # Відповідь 401: оновлюємо токен і повторюємо запит один раз
+        log.info("Токен недійсний або закінчився термін дії. Отримую новий токен...")
+        if not await _refresh_session_token(session, auth, sent_header):
+            log.error("Помилка: не вдалося оновити токен (рік %s)", year)
+            return None
+    return None
+
+
+async def _post_climate_batch(session: "aiohttp.ClientSession",
+                             years: List[int]) -> Tuple[Optional[Dict[int, Any]], bool]:
+    """
+    Виконати один запит getclimate зі списком років
+    
+    Args:
+        session: Сесія aiohttp із заголовком авторизації
+        years: Список років
+    
+    Returns:
+        Кортеж (словник {рік: дані} або None, чи API однозначно відхилило пакетний
+        запит). Мережеві помилки, 5xx та пошкоджена відповідь тимчасові - False
+    """
+    try:
+        async with session.post(CLIMATE_ENDPOINT, json={"years": years}) as response:
+            if response.status != 200:
+                return None, response.status in BATCH_REJECTED_STATUSES
+            response_data = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None, False
+    
+    # Розбиваємо відповідь на дані окремих років (лише якщо рік кожної частини відомий).
+    # Відповідь без даних за роками означає, що список років не підтримується
+    batch_data = split_climate_batch(response_data, years)
+    return batch_data, batch_data is None
+
+
+def create_client_session(token: str) -> "aiohttp.ClientSession":
+    """
+    Створити сесію aiohttp з пулом з'єднань та заголовком авторизації
+    
+    Args:
+        token: Токен авторизації
+    
+    Returns:
+        Об'єкт aiohttp.ClientSession (закривається викликачем)
+    """
+    connect_timeout, read_timeout = Config.REQUEST_TIMEOUT
+    connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}"
+    }
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
+
+class BatchingClient:
+    """
+    Клієнт, що об'єднує одночасні виклики getclimate у пакетні запити
+    
+    Виклики add() накопичуються протягом linger_ms (або до batch_size) і
+    відправляються одним запитом зі списком років. Якщо API не підтримує
+    список років, пакет виконується окремими паралельними запитами.
+    
+    Example:
+        >>> async with create_client_session(token) as session:
+        ...     async with BatchingClient(session) as client:
+        ...         data = await client.add(2023)
+    """
+    
+    def __init__(self, session: "aiohttp.ClientSession", batch_size: int = 32,
+                 linger_ms: int = 20, max_concurrency: int = 3):
+        """
+        Ініціалізація клієнта
+        
+        Args:
+            session: Сесія aiohttp із заголовком авторизації
+            batch_size: Максимальна кількість років в одному пакеті
+            linger_ms: Час очікування інших викликів перед відправкою пакета (мс)
+            max_concurrency: Максимальна кількість пакетів, що виконуються одночасно
+        """
+        self.session = session
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        # Чи приймає API список років в одному запиті (None - ще не перевірено)
+        self._batch_supported: Optional[bool] = None
+    
+    async def add(self, year: int) -> Optional[Dict[str, Any]]:
+        """
+        Отримати дані бізнес-клімату за рік у складі найближчого пакета
+        
+        Args:
+            year: Рік для отримання даних
+        
+        Returns:
+            Словник з даними бізнес-клімату або None у разі помилки
+        """
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((year, future))
+        return await future
+    
+    async def _run(self):
+        """Збирати виклики з черги в пакети та запускати їх відправку"""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[int, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.linger
+                
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                self._start_flush(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # close(): відправляємо пакет, що збирався, і все, що лишилось у черзі,
+            # інакше виклики add() чекали б на свої future вічно
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for start in range(0, len(batch), self.batch_size):
+                self._start_flush(batch[start:start + self.batch_size])
+            raise
+    
+    def _start_flush(self, batch: List[Tuple[int, asyncio.Future]]):
+        """
+        Запустити відправку пакета у фоновій задачі
+        
+        Args:
+            batch: Список пар (рік, future виклику)
+        """
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+    
+    async def _flush(self, batch: List[Tuple[int, asyncio.Future]]):
+        """
+        Відправити пакет та передати результати відповідним викликам
+        
+        Args:
+            batch: Список пар (рік, future виклику)
+        """
+        years = list(dict.fromkeys(year for year, _ in batch))
+        
+        try:
+            async with self._semaphore:
+                results = None
+                if self._batch_supported is not False:
+                    results, rejected = await _post_climate_batch(self.session, years)
+                    if results is not None:
+                        self._batch_supported = True
+                    elif rejected:
+                        # Лише однозначна відмова API вимикає пакетні запити надалі
+                        self._batch_supported = False
+                
+                if results is None:
+                    responses = await asyncio.gather(*(get_climate(self.session, year) for year in years))
+                    results = dict(zip(years, responses))
+        except BaseException as e:
+            # Жоден виклик add() не повинен чекати вічно
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            raise
+        
+        for year, future in batch:
+            if not future.done():
+                future.set_result(results.get(year))
+    
+    async def close(self):
+        """Зупинити збір пакетів і дочекатися відправки всіх прийнятих викликів"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def get_climate_many_async(years: List[int],
+                                 token: Optional[str] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+    """
+    Отримати дані бізнес-клімату за кілька років одночасно
+    
+    Всі запити виконуються паралельно через один пул з'єднань,
+    токен отримується один раз перед запуском запитів. Після відповіді 401
+    токен оновлюється (один раз для всіх запитів) і запит повторюється.
+    
+    Args:
+        years: Список років
+        token: Токен авторизації (якщо None, береться з кешу/.env або виконується авторизація)
+    
+    Returns:
+        Словник {рік: дані або None}
+    """
+    auth = VkursiAuth()
+    if token is None:
+        token = await auth.get_token_async()
+        if not token:
+            log.error("Помилка: не вдалося отримати токен")
+            return {year: None for year in years}
+    
+    async with create_client_session(token) as session:
+        results = await asyncio.gather(*(get_climate(session, year, auth) for year in years))
+    
+    return dict(zip(years, results))
+
+
+def get_climate_many(years: List[int],
+                     token: Optional[str] = None) -> Dict[int, Optional[Dict[str, Any]]]:
+    """
+    Синхронна обгортка над get_climate_many_async
+    
+    Args:
+        years: Список років
+        token: Токен авторизації
+    
+    Returns:
+        Словник {рік: дані або None}
+    
+    Example:
+        >>> results = get_climate_many([2021, 2022, 2023])
+    """
+    if not AIOHTTP_AVAILABLE:
+        log.error("Помилка: aiohttp не встановлено. Встановіть: pip install aiohttp")
+        return {year: None for year in years}
+    
+    return asyncio.run(get_climate_many_async(years, token))
@@ -1,11 +1,19 @@
 """
 Модуль для роботи з конфігурацією та .env файлом
 """
+import logging
 import os
+import shutil
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict
 from dotenv import load_dotenv
 
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
 class Config:
     """Клас для управління конфігурацією програми"""
     
@@ -13,6 +21,9 @@ class Config:
     TOKEN_ENV_KEY = "VKURSI_API_TOKEN"
     EMAIL_ENV_KEY = "VKURSI_EMAIL"
     PASSWORD_ENV_KEY = "VKURSI_PASSWORD"
+    DEBUG_ENV_KEY = "VKURSI_DEBUG"
+    # Таймаути запитів: (з'єднання, читання) в секундах
+    REQUEST_TIMEOUT = (5, 30)
     
     def __init__(self):
         """Ініціалізація конфігурації та завантаження .env файлу"""
@@ -23,6 +34,66 @@ class Config:
         """Отримати токен з .env файлу"""
         return os.getenv(self.TOKEN_ENV_KEY, "")
     
+    def is_debug(self) -> bool:
+        """Чи увімкнено діагностичний вивід (VKURSI_DEBUG=1 у .env або змінних середовища)"""
+        return os.getenv(self.DEBUG_ENV_KEY, "").strip().lower() in ("1", "true", "yes")
+    
+    def _rewrite_env(self, updates: Dict[str, str]):
+        """
+        Оновити значення в .env файлі
+        
+        Файл читається один раз і перезаписується атомарно (через тимчасовий файл)
+        лише якщо хоча б одне значення змінилося. Права доступу файлу зберігаються,
+        а якщо .env - символьне посилання, перезаписується файл, на який воно вказує.
+        
+        Args:
+            updates: Словник {ключ: значення} для збереження
+            
+        Raises:
+            OSError: Якщо не вдалося прочитати або записати файл
+        """
+        env_content = []
+        
+        # Читаємо існуючий .env файл якщо він є
+        if self.env_path.exists():
+            with open(self.env_path, 'r', encoding='utf-8') as f:
+                env_content = f.readlines()
+        
+        # Оновлюємо існуючі ключі
+        pending = dict(updates)
+        changed = False
+        for i, line in enumerate(env_content):
+            key, sep, value = line.partition("=")
+            if sep and key in pending:
+                new_value = pending.pop(key)
+                if value.rstrip("\r\n") != new_value:
+                    env_content[i] = f"{key}={new_value}\n"
+                    changed = True
+        
+        # Додаємо відсутні ключі
+        if pending:
+            if env_content and not env_content[-1].endswith("\n"):
+                env_content[-1] += "\n"
+            for key, value in pending.items():
+                env_content.append(f"{key}={value}\n")
+            changed = True
+        
+        # Зберігаємо оновлений .env файл, якщо щось змінилося
+        if changed:
+            # Замінюємо файл, на який вказує посилання, а не саме посилання
+            env_path = Path(os.path.realpath(self.env_path))
+            tmp_path = env_path.with_name(env_path.name + ".tmp")
+            # Файл містить пароль і токен: тимчасовий файл одразу доступний лише власнику
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.writelines(env_content)
+            if env_path.exists():
+                shutil.copymode(env_path, tmp_path)
+            os.replace(tmp_path, env_path)
+        
+        # Оновлюємо змінні середовища для поточної сесії
+        os.environ.update(updates)
+    
     def save_token(self, token: str) -> bool:
         """
         Зберегти токен в .env файл
@@ -34,34 +105,10 @@ class Config:
             True якщо успішно збережено
         """
         try:
-            env_content = []
-            
-            # Читаємо існуючий .env файл якщо він є
-            if self.env_path.exists():
-                with open(self.env_path, 'r', encoding='utf-8') as f:
-                    env_content = f.readlines()
-            
-            # Оновлюємо або додаємо токен
-            token_found = False
-            for i, line in enumerate(env_content):
-                if line.startswith(f"{self.TOKEN_ENV_KEY}="):
-                    env_content[i] = f"{self.TOKEN_ENV_KEY}={token}\n"
-                    token_found = True
-                    break
-            
-            if not token_found:
-                env_content.append(f"{self.TOKEN_ENV_KEY}={token}\n")
-            
-            # Зберігаємо оновлений .env файл
-            with open(self.env_path, 'w', encoding='utf-8') as f:
-                f.writelines(env_content)
-            
-            # Оновлюємо змінну середовища для поточної сесії
-            os.environ[self.TOKEN_ENV_KEY] = token
-            
+            self._rewrite_env({self.TOKEN_ENV_KEY: token})
             return True
         except Exception as e:
-            print(f"Помилка збереження токену: {e}")
+            log.error("Помилка збереження токену: %s", e)
             return False
     
     def get_credentials(self) -> tuple[str, str]:
@@ -87,39 +134,24 @@ class Config:
             True якщо успішно збережено
         """
         try:
-            env_content = []
-            
-            # Читаємо існуючий .env файл якщо він є
-            if self.env_path.exists():
-                with open(self.env_path, 'r', encoding='utf-8') as f:
-                    env_content = f.readlines()
-            
-            # Оновлюємо або додаємо email та password
-            email_found = False
-            password_found = False
-            
-            for i, line in enumerate(env_content):
-                if line.startswith(f"{self.EMAIL_ENV_KEY}="):
-                    env_content[i] = f"{self.EMAIL_ENV_KEY}={email}\n"
-                    email_found = True
-                elif line.startswith(f"{self.PASSWORD_ENV_KEY}="):
-                    env_content[i] = f"{self.PASSWORD_ENV_KEY}={password}\n"
-                    password_found = True
-            
-            if not email_found:
-                env_content.append(f"{self.EMAIL_ENV_KEY}={email}\n")
-            if not password_found:
-                env_content.append(f"{self.PASSWORD_ENV_KEY}={password}\n")
-            
-            # Зберігаємо оновлений .env файл
-            with open(self.env_path, 'w', encoding='utf-8') as f:
-                f.writelines(env_content)
-            
-            # Оновлюємо змінні середовища для поточної сесії
-            os.environ[self.EMAIL_ENV_KEY] = email
-            os.environ[self.PASSWORD_ENV_KEY] = password
-            
+            self._rewrite_env({
+                self.EMAIL_ENV_KEY: email,
+                self.PASSWORD_ENV_KEY: password
+            })
             return True
         except Exception as e:
-            print(f"Помилка збереження облікових даних: {e}")
+            log.error("Помилка збереження облікових даних: %s", e)
             return False
+
+
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """
+    Отримати спільний об'єкт конфігурації
+    
+    .env файл завантажується лише один раз за весь час роботи програми
+    
+    Returns:
+        Об'єкт Config
+    """
+    return Config()
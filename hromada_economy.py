@@ -1,74 +1,182 @@
 """
 Модуль для роботи з API Hromada GetEconomyList (список громад)
 """
+import hashlib
+import logging
+import re
+import tempfile
 import requests
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from config import Config
+from typing import Optional, Dict, Any, List, ClassVar, Set, Tuple, Iterable, Iterator
+import json_utils
+from api_client import VkursiAPIClient, response_has_data
 from auth import VkursiAuth
+from response_cache import ResponseCache, max_age_from_headers
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
 
-class HromadaEconomyAPI:
-    """Клас для роботи з API Hromada GetEconomyList"""
+
+# Розрізи статистики SWOT звіту (бітові прапорці) та підрядки ключів, що на них вказують
+_FOP = 1
+_COMPANY = 2
+_KVED = 4
+_LAND = 8
+_OBJECT = 16
+_PROCUREMENT = 32
+
+_STAT_BUCKETS = (
+    (_FOP, ("fop", "фоп")),
+    (_COMPANY, ("company", "компані", "юо")),
+    (_KVED, ("kved", "квед")),
+    (_LAND, ("land", "земель", "ділянк")),
+    (_OBJECT, ("object", "об'єкт", "обект")),
+    (_PROCUREMENT, ("procurement", "закупівл", "тендер"))
+)
+# Один регулярний вираз для всіх розрізів: кожен розріз - іменована група (b<прапорець>),
+# а lookahead знаходить збіги на кожній позиції ключа, включно з тими, що перекриваються.
+# Жоден підрядок не є префіксом підрядка іншого розрізу, тож на одній позиції
+# може збігтися лише один розріз
+_STAT_KEY_RE = re.compile("(?=" + "|".join(
+    f"(?P<b{bucket}>" + "|".join(re.escape(substring) for substring in substrings) + ")"
+    for bucket, substrings in _STAT_BUCKETS
+) + ")")
+
+
+# Типи числових значень у розібраному JSON (bool, як і раніше, рахується числом)
+_NUMBER_TYPES = frozenset((int, float, bool))
+
+# Поля статистики, що обчислюються як сума знайдених значень: (розріз, поле)
+_SUMMED_FIELDS = (
+    ("fop_companies", "fop_count"),
+    ("fop_companies", "companies_count"),
+    ("land_plots", "count"),
+    ("land_plots", "total_area"),
+    ("objects", "count"),
+    ("public_procurements", "count"),
+    ("public_procurements", "total_amount")
+)
+
+
+def _reduce_statistics(statistics: Dict[str, Any], collected: Dict[tuple, List[Any]]):
+    """
+    Підсумувати зібрані при обході значення та обчислити загальні показники
     
-    def __init__(self, token: Optional[str] = None):
-        """
-        Ініціалізація класу Hromada Economy API
+    Args:
+        statistics: Словник статистики, який заповнюється
+        collected: Списки значень для кожного поля з _SUMMED_FIELDS
+    """
+    for (section, field), values in collected.items():
+        statistics[section][field] = sum(values)
+    
+    fop = statistics["fop_companies"]
+    fop["total_count"] = fop["fop_count"] + fop["companies_count"]
+
+
+@lru_cache(maxsize=4096)
+def _key_mask(key: Any) -> int:
+    """
+    Визначити розрізи статистики, на які вказує ключ
+    
+    Ключ сканується одним регулярним виразом для всіх розрізів. Результат
+    кешується: у SWOT звітах ті самі ключі повторюються в кожному елементі
+    списків, тож сканування виконується один раз на ключ.
+    
+    Args:
+        key: Ключ словника
         
-        Args:
-            token: Токен авторизації (якщо None, береться з .env або виконується авторизація)
-        """
-        self.config = Config()
-        self.base_url = self.config.BASE_URL
-        self.auth = VkursiAuth()
-        
-        # Отримуємо токен
-        if token:
-            self.token = token
-        else:
-            self.token = self.auth.get_token()
+    Returns:
+        Маска з прапорців _FOP, _COMPANY, _KVED, _LAND, _OBJECT, _PROCUREMENT
+    """
+    mask = 0
+    for match in _STAT_KEY_RE.finditer(str(key).lower()):
+        mask |= int(match.lastgroup[1:])
+    return mask
+
+
+def _iter_economy_items(events: Iterable[Tuple[str, str, Any]],
+                        response_info: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Повертати записи списку громад з потоку подій ijson.parse по одному
     
-    def _get_headers(self) -> Dict[str, str]:
-        """
-        Отримати заголовки для API запитів
+    Записи поля data віддаються по мірі розбору, решта полів верхнього
+    рівня відповіді збираються в response_info.
+    
+    Args:
+        events: Події ijson.parse для відповіді GetEconomyList
+        response_info: Словник, який заповнюється полями відповіді, крім data
         
-        Returns:
-            Словник з заголовками
-        """
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.token}"
-        }
+    Returns:
+        Ітератор записів поля data
+    """
+    builder = None
+    target = None
+    depth = 0
+    
+    for prefix, event, value in events:
+        if builder is None:
+            if prefix == "data.item":
+                target = None
+            elif prefix and prefix != "data" and "." not in prefix:
+                target = prefix
+            else:
+                # Події верхнього рівня та самого списку data
+                continue
+            builder = ijson.ObjectBuilder()
+            depth = 0
+        
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        
+        # Значення зібране повністю
+        if depth == 0:
+            if target is None:
+                yield builder.value
+            else:
+                response_info[target] = builder.value
+            builder = None
+
+
+class HromadaEconomyAPI(VkursiAPIClient):
+    """Клас для роботи з API Hromada GetEconomyList"""
     
-    def _handle_response(self, response: requests.Response) -> Optional[Dict[str, Any]]:
+    # Термін актуальності кешу, якщо API не повідомляє його в Cache-Control (секунди)
+    CACHE_TTL = 60 * 60
+    
+    # Директорії, вже створені під час роботи програми
+    _ensured_dirs: ClassVar[Set[str]] = set()
+    
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None,
+                 use_cache: bool = True, output_dir: str = "output",
+                 auth: Optional[VkursiAuth] = None):
         """
-        Обробити відповідь API
+        Ініціалізація класу Hromada Economy API
         
         Args:
-            response: Об'єкт відповіді requests
-            
-        Returns:
-            Словник з даними або None у разі помилки
+            token: Токен авторизації (якщо None, береться з .env або виконується авторизація)
+            session: HTTP сесія (якщо None, використовується спільна сесія процесу)
+            use_cache: Кешувати відповіді API на диску (<output_dir>/.economy_cache)
+            output_dir: Директорія кешу (за замовчуванням "output")
+            auth: Об'єкт авторизації (якщо None, використовується спільний get_auth())
         """
-        if response.status_code == 401:
-            print("Токен недійсний або закінчився термін дії. Отримую новий токен...")
-            new_token = self.auth.authorize()
-            if new_token:
-                self.token = new_token
-                print("Отримано новий токен. Повторіть запит.")
-            return None
-        elif response.status_code == 200:
-            try:
-                return response.json()
-            except ValueError:
-                print("Помилка: не вдалося розпарсити JSON відповідь")
-                return None
-        else:
-            print(f"Помилка API: {response.status_code}")
-            print(f"Відповідь: {response.text}")
-            return None
+        super().__init__(token, session, auth)
+        # Діагностичний вивід відповідей API (може серіалізувати великі відповіді)
+        self.debug = self.config.is_debug()
+        
+        # Кеш відповідей GetEconomyList та getswot
+        self.cache = ResponseCache(Path(output_dir) / ".economy_cache") if use_cache else None
     
     def get_economy_list(self, date_from: str = "", date_to: str = "") -> Optional[Dict[str, Any]]:
         """
@@ -83,13 +191,16 @@ class HromadaEconomyAPI:
         """
         endpoint = f"{self.base_url}/api/1.0/Hromada/GetEconomyList"
         
-        # Перевіряємо наявність токену
-        if not self.token:
-            print("Токен не знайдено. Виконую авторизацію...")
-            self.token = self.auth.authorize()
-            if not self.token:
-                print("Помилка: не вдалося отримати токен")
-                return None
+        # Якщо відповідь є в кеші і ще актуальна, запит (і токен) не потрібен
+        cache_key = self._cache_key(f"economylist:{date_from}:{date_to}")
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return json_utils.loads(cached)
+        
+        # Перевіряємо наявність токену та оновлюємо його до закінчення терміну дії
+        if not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return None
         
         # Формуємо тіло запиту
         payload = {
@@ -99,17 +210,20 @@ class HromadaEconomyAPI:
         
         try:
             # Виконуємо POST запит
-            response = requests.post(
+            response = self._request_with_reauth(
+                "POST",
                 endpoint,
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30
+                json=payload
             )
             
-            return self._handle_response(response)
+            economy_data = self._handle_response(response)
+            # Відповіді без даних (success: false, errorMessage) не кешуються
+            if response_has_data(economy_data):
+                self._store_cached(cache_key, response)
+            return economy_data
             
         except requests.exceptions.RequestException as e:
-            print(f"Помилка під час виконання запиту: {e}")
+            log.error("Помилка під час виконання запиту: %s", e)
             return None
     
     def save_economy_list_to_file(self, economy_data: Dict[str, Any], 
@@ -125,62 +239,222 @@ class HromadaEconomyAPI:
             Шлях до збереженого файлу або None у разі помилки
         """
         if not economy_data:
-            print("Помилка: немає даних для збереження")
+            log.error("Помилка: немає даних для збереження")
             return None
         
         try:
             # Створюємо директорію якщо вона не існує
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
+            output_path = self._ensure_output_dir(output_dir)
             
             # Отримуємо список громад з даних
             data_list = economy_data.get("data", [])
             
-            # Формуємо загальну назву (якщо є кілька громад)
-            hromada_names = []
-            if data_list:
-                for item in data_list[:5]:  # Перші 5 для прикладу в назві
-                    name = item.get("name")
-                    if name:
-                        hromada_names.append(str(name))
-            
-            hromada_name_suffix = "_".join(hromada_names[:2]) if hromada_names else "list"
-            if len(hromada_names) > 2:
-                hromada_name_suffix += f"_and_{len(data_list)}_more"
-            
-            # Формуємо ім'я файлу з датою
-            current_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"hromada_economy_{hromada_name_suffix}_{current_date}.json"
-            # Обмежуємо довжину назви файлу
-            if len(filename) > 200:
-                filename = f"hromada_economy_list_{current_date}.json"
-            
-            filepath = output_path / filename
-            
-            # Створюємо структурований JSON з метаданими
-            structured_data = {
-                "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "date_created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "description": f"Список громад (GetEconomyList). Файл створено {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}. Кількість записів: {len(data_list)}",
-                    "total_records": len(data_list)
-                },
-                "data": economy_data.get("data", []),
-                "response_info": {
-                    k: v for k, v in economy_data.items() if k != "data"
-                }
-            }
+            # Назви для імені файлу беремо з перших 5 записів
+            hromada_names = self._economy_file_names(islice(data_list, 5))
+            response_info = {k: v for k, v in economy_data.items() if k != "data"}
             
-            # Зберігаємо у JSON файл з красивим форматуванням
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, ensure_ascii=False, indent=2)
+            filepath = self._write_economy_file(
+                output_path, data_list, len(data_list), hromada_names, response_info
+            )
             
-            print(f"Дані збережено у файл: {filepath}")
+            log.info("Дані збережено у файл: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            print(f"Помилка збереження файлу: {e}")
+            log.error("Помилка збереження файлу: %s", e)
+            return None
+    
+    def save_economy_list_streaming(self, date_from: str = "", date_to: str = "",
+                                    output_dir: str = "output") -> Optional[str]:
+        """
+        Отримати список громад і зберегти його у файл без завантаження всієї відповіді в пам'ять
+        
+        Відповідь розбирається потоково (ijson): записи по одному пишуться у
+        тимчасовий файл, а потім у результуючий файл того ж формату, що й
+        save_economy_list_to_file. Якщо ijson не встановлено, виконується
+        звичайне завантаження. Кеш відповідей у цьому режимі не використовується.
+        
+        Args:
+            date_from: Дата початку періоду (за замовчуванням пустий рядок)
+            date_to: Дата кінця періоду (за замовчуванням пустий рядок)
+            output_dir: Директорія для збереження файлів (за замовчуванням "output")
+            
+        Returns:
+            Шлях до збереженого файлу або None у разі помилки
+        """
+        if not IJSON_AVAILABLE:
+            log.warning("Попередження: ijson не встановлено (pip install ijson). Виконую звичайне завантаження...")
+            economy_data = self.get_economy_list(date_from=date_from, date_to=date_to)
+            return self.save_economy_list_to_file(economy_data, output_dir) if economy_data else None
+        
+        # Перевіряємо наявність токену та оновлюємо його до закінчення терміну дії
+        if not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return None
+        
+        try:
+            response = self._request_with_reauth(
+                "POST",
+                f"{self.base_url}/api/1.0/Hromada/GetEconomyList",
+                json={"dateFrom": date_from, "dateTo": date_to},
+                stream=True
+            )
+        except requests.exceptions.RequestException as e:
+            log.error("Помилка під час виконання запиту: %s", e)
+            return None
+        
+        with response:
+            if response.status_code != 200:
+                self._handle_response(response)
+                return None
+            
+            try:
+                output_path = self._ensure_output_dir(output_dir)
+                
+                # Розпаковуємо gzip/deflate при читанні сирого потоку
+                response.raw.decode_content = True
+                response_info: Dict[str, Any] = {}
+                hromada_names: List[str] = []
+                total_records = 0
+                
+                with tempfile.TemporaryFile(dir=output_path) as spool:
+                    # Записи по одному в рядку (компактний JSON)
+                    events = ijson.parse(response.raw, use_float=True)
+                    for item in _iter_economy_items(events, response_info):
+                        spool.write(json_utils.dumps(item, pretty=False) + b"\n")
+                        if total_records < 5:
+                            hromada_names.extend(self._economy_file_names((item,)))
+                        total_records += 1
+                    
+                    spool.seek(0)
+                    filepath = self._write_economy_file(
+                        output_path, (json_utils.loads(line) for line in spool),
+                        total_records, hromada_names, response_info
+                    )
+                
+                log.info("Дані збережено у файл: %s", filepath)
+                return str(filepath)
+                
+            except Exception as e:
+                log.error("Помилка збереження файлу: %s", e)
+                return None
+    
+    @staticmethod
+    def _economy_file_names(items: Iterable[Any]) -> List[str]:
+        """
+        Отримати назви громад для імені файлу
+        
+        Args:
+            items: Записи списку громад
+            
+        Returns:
+            Непорожні назви у вигляді рядків
+        """
+        return [
+            name if isinstance(name, str) else str(name)
+            for name in (item.get("name") for item in items)
+            if name
+        ]
+    
+    def _write_economy_file(self, output_path: Path, data_items: Iterable[Any], total_records: int,
+                            hromada_names: List[str], response_info: Dict[str, Any]) -> Path:
+        """
+        Записати список громад у структурований JSON файл
+        
+        Args:
+            output_path: Директорія для збереження (вже існує)
+            data_items: Записи списку громад (список або ітератор)
+            total_records: Кількість записів
+            hromada_names: Назви громад з перших 5 записів для імені файлу
+            response_info: Поля відповіді API, крім data
+            
+        Returns:
+            Шлях до збереженого файлу
+        """
+        hromada_name_suffix = "_".join(hromada_names[:2]) if hromada_names else "list"
+        if len(hromada_names) > 2:
+            hromada_name_suffix += f"_and_{total_records}_more"
+        
+        # Один момент часу для імені файлу та метаданих
+        now = datetime.now().astimezone()
+        date_created = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Формуємо ім'я файлу з датою
+        current_date = now.strftime("%Y-%m-%d_%H-%M-%S")
+        filename = f"hromada_economy_{hromada_name_suffix}_{current_date}.json"
+        # Обмежуємо довжину назви файлу (хеш назви залишає її впізнаваною між запусками)
+        if len(filename) > 200:
+            name_hash = hashlib.blake2b(hromada_name_suffix.encode("utf-8"), digest_size=6).hexdigest()
+            filename = f"hromada_economy_list_{name_hash}_{current_date}.json"
+        
+        filepath = output_path / filename
+        
+        # Створюємо структурований JSON з метаданими
+        structured_fields = (
+            ("metadata", {
+                "created_at": now.isoformat(),
+                "date_created": date_created,
+                "description": f"Список громад (GetEconomyList). Файл створено {date_created}. Кількість записів: {total_records}",
+                "total_records": total_records
+            }),
+            ("data", data_items),
+            ("response_info", response_info)
+        )
+        
+        # Зберігаємо у JSON файл з красивим форматуванням (список громад - поелементно)
+        json_utils.dump_fields_to_file(structured_fields, filepath)
+        return filepath
+    
+    def _ensure_output_dir(self, output_dir: str) -> Path:
+        """
+        Створити директорію для збереження файлів (лише при першому зверненні)
+        
+        Args:
+            output_dir: Директорія для збереження файлів
+            
+        Returns:
+            Шлях до директорії
+        """
+        output_path = Path(output_dir)
+        if output_dir not in self._ensured_dirs:
+            output_path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+        return output_path
+    
+    def _get_cached(self, cache_key: str) -> Optional[bytes]:
+        """
+        Отримати актуальну відповідь з кешу
+        
+        Args:
+            cache_key: Ключ запису
+            
+        Returns:
+            Тіло відповіді або None, якщо запису немає або він застарів
+        """
+        if not self.cache:
             return None
+        cached = self.cache.get(cache_key)
+        if cached and ResponseCache.is_fresh(cached):
+            return cached["content"]
+        return None
+    
+    def _store_cached(self, cache_key: str, response: requests.Response):
+        """
+        Зберегти успішну відповідь у кеш
+        
+        Args:
+            cache_key: Ключ запису
+            response: Відповідь API зі статусом 200
+        """
+        if not self.cache or response.status_code != 200:
+            return
+        max_age = max_age_from_headers(response.headers)
+        self.cache.set(
+            cache_key,
+            response.content,
+            etag=response.headers.get("ETag"),
+            max_age=self.CACHE_TTL if max_age is None else max_age
+        )
     
     def _handle_swot_response(self, response: requests.Response) -> Optional[Dict[str, Any]]:
         """
@@ -195,72 +469,85 @@ class HromadaEconomyAPI:
         status_code = response.status_code
         
         try:
-            response_data = response.json()
-            
-            # Діагностика: виводимо структуру відповіді для відлагодження
-            print(f"\nДіагностика відповіді API (статус {status_code}):")
-            print(f"Ключі в відповіді: {list(response_data.keys())}")
+            response_data = json_utils.loads(response.content)
+        except ValueError:
+            log.error("Помилка: не вдалося розпарсити JSON відповідь. Сира відповідь: %s",
+                      response.text)
+            return None
+        
+        # Діагностика: виводимо структуру відповіді для відлагодження
+        if self.debug:
+            log.info("Діагностика відповіді API (статус %s). Ключі в відповіді: %s",
+                     status_code, list(response_data.keys()))
+        
+        if status_code not in (200, 400, 403):
+            # Інші статуси
+            log.error("Невідомий статус: %s. Відповідь: %s", status_code, response.text)
+            return None
+        
+        return self._swot_result(status_code, response_data)
+    
+    def _swot_result(self, status_code: int, response_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Сформувати результат SWOT звіту з розпарсеної відповіді API
+        
+        Args:
+            status_code: Статус відповіді (200, 400 або 403)
+            response_data: Розпарсена відповідь API
             
-            # Статус 403 - не вистачає прав
-            if status_code == 403:
-                error_msg = response_data.get("ErrorMessage", "Не вистачає прав на операцію")
-                print(f"Помилка {status_code}: {error_msg}")
+        Returns:
+            Словник зі статусом, даними та повідомленням про помилку
+        """
+        # Статус 403 - не вистачає прав
+        if status_code == 403:
+            error_msg = response_data.get("ErrorMessage", "Не вистачає прав на операцію")
+            log.error("Помилка %s: %s", status_code, error_msg)
+            return {
+                "status": status_code,
+                "data": None,
+                "errorMessage": error_msg,
+                "success": False
+            }
+        
+        # Статус 200 - успіх або дані не знайдено
+        if status_code == 200:
+            # Перевіряємо різні варіанти назв полів (Data, data)
+            data = response_data.get("Data") or response_data.get("data")
+            error_msg = response_data.get("ErrorMessage") or response_data.get("errorMessage")
+            
+            # Якщо дані не знайдено, перевіряємо всю відповідь
+            if data is None:
+                log.warning("Дані не знайдено в полі 'Data' або 'data'")
+                if self.debug:
+                    log.info("Повна відповідь API: %s", json_utils.dumps(response_data).decode('utf-8'))
+            
+            if error_msg:
+                log.warning("Попередження: %s", error_msg)
                 return {
                     "status": status_code,
-                    "data": None,
+                    "data": data,
                     "errorMessage": error_msg,
-                    "success": False
+                    "success": data is not None,
+                    "raw_response": response_data  # Додаємо повну відповідь для діагностики
                 }
-            
-            # Статус 200 - успіх або дані не знайдено
-            if status_code == 200:
-                # Перевіряємо різні варіанти назв полів (Data, data)
-                data = response_data.get("Data") or response_data.get("data")
-                error_msg = response_data.get("ErrorMessage") or response_data.get("errorMessage")
-                
-                # Якщо дані не знайдено, перевіряємо всю відповідь
-                if data is None:
-                    print("Дані не знайдено в полі 'Data' або 'data'")
-                    print(f"Повна відповідь API: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-                
-                if error_msg:
-                    print(f"Попередження: {error_msg}")
-                    return {
-                        "status": status_code,
-                        "data": data,
-                        "errorMessage": error_msg,
-                        "success": data is not None,
-                        "raw_response": response_data  # Додаємо повну відповідь для діагностики
-                    }
-                else:
-                    return {
-                        "status": status_code,
-                        "data": data,
-                        "errorMessage": None,
-                        "success": data is not None,
-                        "raw_response": response_data  # Додаємо повну відповідь для діагностики
-                    }
-            
-            # Статус 400 - помилка в запиті
-            if status_code == 400:
-                error_msg = response_data.get("ErrorMessage", "Помилка запиту")
-                print(f"Помилка {status_code}: {error_msg}")
+            else:
                 return {
                     "status": status_code,
-                    "data": None,
-                    "errorMessage": error_msg,
-                    "success": False
+                    "data": data,
+                    "errorMessage": None,
+                    "success": data is not None,
+                    "raw_response": response_data  # Додаємо повну відповідь для діагностики
                 }
-            
-            # Інші статуси
-            print(f"Невідомий статус: {status_code}")
-            print(f"Відповідь: {response.text}")
-            return None
-            
-        except ValueError:
-            print("Помилка: не вдалося розпарсити JSON відповідь")
-            print(f"Сира відповідь: {response.text}")
-            return None
+        
+        # Статус 400 - помилка в запиті
+        error_msg = response_data.get("ErrorMessage", "Помилка запиту")
+        log.error("Помилка %s: %s", status_code, error_msg)
+        return {
+            "status": status_code,
+            "data": None,
+            "errorMessage": error_msg,
+            "success": False
+        }
     
     def get_swot_report(self, register_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -273,7 +560,7 @@ class HromadaEconomyAPI:
             Словник з даними SWOT звіту або None у разі помилки
         """
         if not register_id or not register_id.strip():
-            print("Помилка: register_id не може бути порожнім")
+            log.error("Помилка: register_id не може бути порожнім")
             return {
                 "status": 400,
                 "data": None,
@@ -281,30 +568,63 @@ class HromadaEconomyAPI:
                 "success": False
             }
         
-        endpoint = f"{self.base_url}/api/1.0/hromada/getswot/{register_id.strip()}"
+        register_id = register_id.strip()
+        endpoint = f"{self.base_url}/api/1.0/hromada/getswot/{register_id}"
         
-        # Перевіряємо наявність токену
-        if not self.token:
-            print("Токен не знайдено. Виконую авторизацію...")
-            self.token = self.auth.authorize()
-            if not self.token:
-                print("Помилка: не вдалося отримати токен")
-                return None
+        # Якщо відповідь є в кеші і ще актуальна, запит (і токен) не потрібен
+        cache_key = self._cache_key(f"getswot:{register_id}")
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            log.info("SWOT звіт %s взято з кешу", register_id)
+            return self._swot_result(200, json_utils.loads(cached))
+        
+        # Перевіряємо наявність токену та оновлюємо його до закінчення терміну дії
+        if not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return None
         
         try:
             # Виконуємо GET запит
-            response = requests.get(
-                endpoint,
-                headers=self._get_headers(),
-                timeout=30
-            )
+            response = self._request_with_reauth("GET", endpoint)
             
-            return self._handle_swot_response(response)
+            swot_data = self._handle_swot_response(response)
+            # Кешуємо лише успішний звіт з даними, щоб тимчасову помилку API
+            # (success: false, errorMessage, порожні data) не повторювати годину з кешу
+            if swot_data is not None and swot_data["data"] and not swot_data["errorMessage"]:
+                self._store_cached(cache_key, response)
+            return swot_data
             
         except requests.exceptions.RequestException as e:
-            print(f"Помилка під час виконання запиту: {e}")
+            log.error("Помилка під час виконання запиту: %s", e)
             return None
     
+    def get_swot_reports_bulk(self, register_ids: List[str],
+                              max_workers: int = 8) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Отримати SWOT звіти кількох громад паралельно
+        
+        Запити виконуються в пулі потоків через спільну сесію, тому загальний
+        час близький до часу одного запиту, а не їх суми.
+        
+        Args:
+            register_ids: Список ID реєстрації громад
+            max_workers: Максимальна кількість одночасних запитів
+            
+        Returns:
+            Словник {register_id: дані SWOT звіту або None}
+        """
+        # Прибираємо дублікати, зберігаючи порядок
+        register_ids = list(dict.fromkeys(rid.strip() for rid in register_ids if rid and rid.strip()))
+        
+        # Оновлюємо токен один раз до запуску потоків, щоб потоки не чекали авторизації
+        if register_ids and not self._ensure_token():
+            log.error("Помилка: не вдалося отримати токен")
+            return {register_id: None for register_id in register_ids}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            reports = executor.map(self.get_swot_report, register_ids)
+            return dict(zip(register_ids, reports))
+    
     def process_swot_statistics(self, swot_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Обробити SWOT звіт і витягти основну статистику за розрізами
@@ -340,92 +660,105 @@ class HromadaEconomyAPI:
         }
         
         # Отримуємо дані з різних місць відповіді
-        raw_response = swot_data.get("raw_response", {})
+        raw_response = swot_data.get("raw_response") or {}
         data = swot_data.get("data") or raw_response.get("Data") or raw_response.get("data")
         
-        if not data:
+        # Порожні дані або скалярне значення статистики не містять - обхід не потрібен
+        if not data or not isinstance(data, (dict, list)):
             return statistics
         
-        # Рекурсивно шукаємо дані в структурі
-        def find_statistics(obj: Any, path: str = ""):
-            """Рекурсивно шукаємо статистику в структурі даних"""
+        kved_list = statistics["kved"]["kved_list"]
+        
+        # Значення збираємо у списки і підсумовуємо один раз після обходу
+        collected = {field: [] for field in _SUMMED_FIELDS}
+        fop_counts = collected[("fop_companies", "fop_count")]
+        company_counts = collected[("fop_companies", "companies_count")]
+        land_counts = collected[("land_plots", "count")]
+        land_areas = collected[("land_plots", "total_area")]
+        object_counts = collected[("objects", "count")]
+        procurement_counts = collected[("public_procurements", "count")]
+        procurement_amounts = collected[("public_procurements", "total_amount")]
+        
+        # Обходимо структуру без рекурсії. Для кожного вузла зберігаємо маску розрізів,
+        # які зустрілися в ключах на шляху до нього (замість рядка шляху).
+        # Методи стеку та функцію маски прив'язуємо до локальних імен для швидкого доступу
+        stack: List[Tuple[Any, int]] = [(data, 0)]
+        pop = stack.pop
+        push = stack.append
+        key_mask = _key_mask
+        while stack:
+            obj, mask = pop()
+            
             if isinstance(obj, dict):
-                # Шукаємо ФОП та компанії
-                key_lower = path.lower()
-                if "fop" in key_lower or "фоп" in key_lower:
-                    if isinstance(obj.get("count"), (int, float)):
-                        statistics["fop_companies"]["fop_count"] += int(obj["count"])
-                if "company" in key_lower or "компані" in key_lower or "юо" in key_lower:
-                    if isinstance(obj.get("count"), (int, float)):
-                        statistics["fop_companies"]["companies_count"] += int(obj["count"])
-                
-                # Шукаємо КВЕД
-                if "kved" in key_lower or "квед" in key_lower:
-                    if isinstance(obj, list):
-                        statistics["kved"]["kved_list"].extend(obj)
-                    elif isinstance(obj, dict):
+                if mask:
+                    # Числові поля читаємо один раз; type() in швидше за isinstance()
+                    count = obj.get("count")
+                    has_count = type(count) in _NUMBER_TYPES
+                    
+                    # ФОП та компанії
+                    if mask & _FOP and has_count:
+                        fop_counts.append(int(count))
+                    if mask & _COMPANY and has_count:
+                        company_counts.append(int(count))
+                    
+                    # КВЕД
+                    if mask & _KVED:
                         if "list" in obj:
-                            statistics["kved"]["kved_list"].extend(obj["list"])
+                            kved_list.extend(obj["list"])
                         elif "items" in obj:
-                            statistics["kved"]["kved_list"].extend(obj["items"])
-                
-                # Шукаємо земельні ділянки
-                if "land" in key_lower or "земель" in key_lower or "ділянк" in key_lower:
-                    if isinstance(obj.get("count"), (int, float)):
-                        statistics["land_plots"]["count"] += int(obj["count"])
-                    if isinstance(obj.get("area"), (int, float)):
-                        statistics["land_plots"]["total_area"] += float(obj["area"])
-                    if isinstance(obj.get("total_area"), (int, float)):
-                        statistics["land_plots"]["total_area"] += float(obj["total_area"])
-                
-                # Шукаємо об'єкти
-                if "object" in key_lower or "об'єкт" in key_lower or "обект" in key_lower:
-                    if isinstance(obj.get("count"), (int, float)):
-                        statistics["objects"]["count"] += int(obj["count"])
+                            kved_list.extend(obj["items"])
+                    
+                    # Земельні ділянки
+                    if mask & _LAND:
+                        if has_count:
+                            land_counts.append(int(count))
+                        area = obj.get("area")
+                        if type(area) in _NUMBER_TYPES:
+                            land_areas.append(float(area))
+                        total_area = obj.get("total_area")
+                        if type(total_area) in _NUMBER_TYPES:
+                            land_areas.append(float(total_area))
+                    
+                    # Об'єкти
+                    if mask & _OBJECT and has_count:
+                        object_counts.append(int(count))
+                    
+                    # Публічні закупівлі
+                    if mask & _PROCUREMENT:
+                        if has_count:
+                            procurement_counts.append(int(count))
+                        amount = obj.get("amount")
+                        if type(amount) in _NUMBER_TYPES:
+                            procurement_amounts.append(float(amount))
+                        total_amount = obj.get("total_amount")
+                        if type(total_amount) in _NUMBER_TYPES:
+                            procurement_amounts.append(float(total_amount))
                 
-                # Шукаємо публічні закупівлі
-                if "procurement" in key_lower or "закупівл" in key_lower or "тендер" in key_lower:
-                    if isinstance(obj.get("count"), (int, float)):
-                        statistics["public_procurements"]["count"] += int(obj["count"])
-                    if isinstance(obj.get("amount"), (int, float)):
-                        statistics["public_procurements"]["total_amount"] += float(obj["amount"])
-                    if isinstance(obj.get("total_amount"), (int, float)):
-                        statistics["public_procurements"]["total_amount"] += float(obj["total_amount"])
-                
-                # Рекурсивно обробляємо вкладені об'єкти
-                for key, value in obj.items():
-                    new_path = f"{path}.{key}" if path else key
-                    find_statistics(value, new_path)
+                # Додаємо дочірні словники та списки у зворотному порядку, щоб обхід ішов
+                # у порядку ключів. Скалярні значення самі по собі статистики не містять
+                for key, value in reversed(obj.items()):
+                    if isinstance(value, (dict, list)):
+                        push((value, mask | key_mask(key)))
             
             elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    new_path = f"{path}[{i}]"
-                    find_statistics(item, new_path)
+                for item in reversed(obj):
+                    if isinstance(item, (dict, list)):
+                        push((item, mask))
         
-        # Запускаємо пошук статистики
-        find_statistics(data)
+        # Обчислюємо суми та загальні показники
+        _reduce_statistics(statistics, collected)
         
-        # Обчислюємо загальні показники
-        statistics["fop_companies"]["total_count"] = (
-            statistics["fop_companies"]["fop_count"] + 
-            statistics["fop_companies"]["companies_count"]
-        )
-        statistics["kved"]["kved_count"] = len(statistics["kved"]["kved_list"])
-        
-        # Видаляємо дублікати КВЕДів якщо це словники
-        if statistics["kved"]["kved_list"]:
-            unique_kveds = []
-            seen = set()
-            for kved in statistics["kved"]["kved_list"]:
-                if isinstance(kved, dict):
-                    kved_str = str(kved)
-                else:
-                    kved_str = str(kved)
-                if kved_str not in seen:
-                    seen.add(kved_str)
-                    unique_kveds.append(kved)
-            statistics["kved"]["kved_list"] = unique_kveds
-            statistics["kved"]["kved_count"] = len(unique_kveds)
+        # Видаляємо дублікати КВЕДів. Ключ - JSON з відсортованими ключами, тому
+        # однакові словники з різним порядком ключів вважаються дублікатами
+        unique_kveds = []
+        seen = set()
+        for kved in kved_list:
+            kved_key = json_utils.dumps(kved, pretty=False, sort_keys=True)
+            if kved_key not in seen:
+                seen.add(kved_key)
+                unique_kveds.append(kved)
+        statistics["kved"]["kved_list"] = unique_kveds
+        statistics["kved"]["kved_count"] = len(unique_kveds)
         
         return statistics
     
@@ -443,16 +776,19 @@ class HromadaEconomyAPI:
             Шлях до збереженого файлу або None у разі помилки
         """
         if not swot_data:
-            print("Помилка: немає даних для збереження")
+            log.error("Помилка: немає даних для збереження")
             return None
         
         try:
             # Створюємо директорію якщо вона не існує
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
+            output_path = self._ensure_output_dir(output_dir)
+            
+            # Один момент часу для імені файлу та метаданих
+            now = datetime.now().astimezone()
+            date_created = now.strftime("%Y-%m-%d %H:%M:%S")
             
             # Формуємо ім'я файлу з датою та register_id
-            current_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            current_date = now.strftime("%Y-%m-%d_%H-%M-%S")
             filename = f"hromada_swot_{register_id}_{current_date}.json"
             filepath = output_path / filename
             
@@ -460,32 +796,31 @@ class HromadaEconomyAPI:
             processed_statistics = self.process_swot_statistics(swot_data)
             
             # Створюємо структурований JSON з метаданими
-            structured_data = {
-                "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "date_created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            structured_fields = (
+                ("metadata", {
+                    "created_at": now.isoformat(),
+                    "date_created": date_created,
                     "register_id": register_id,
-                    "description": f"SWOT звіт громади (registerId: {register_id}). Файл створено {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    "description": f"SWOT звіт громади (registerId: {register_id}). Файл створено {date_created}",
                     "status_code": swot_data.get("status"),
                     "success": swot_data.get("success", False)
-                },
-                "statistics": processed_statistics,  # Оброблена статистика
-                "data": swot_data.get("data"),
-                "error_message": swot_data.get("errorMessage"),
-                "response_info": {
+                }),
+                ("statistics", processed_statistics),  # Оброблена статистика
+                ("data", swot_data.get("data")),
+                ("error_message", swot_data.get("errorMessage")),
+                ("response_info", {
                     "status": swot_data.get("status"),
                     "success": swot_data.get("success", False)
-                },
-                "raw_response": swot_data.get("raw_response")  # Додаємо повну відповідь API для діагностики
-            }
+                }),
+                ("raw_response", swot_data.get("raw_response"))  # Додаємо повну відповідь API для діагностики
+            )
             
-            # Зберігаємо у JSON файл з красивим форматуванням
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, ensure_ascii=False, indent=2)
+            # Зберігаємо у JSON файл з красивим форматуванням (поле за полем)
+            json_utils.dump_fields_to_file(structured_fields, filepath)
             
-            print(f"Дані збережено у файл: {filepath}")
+            log.info("Дані збережено у файл: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            print(f"Помилка збереження файлу: {e}")
+            log.error("Помилка збереження файлу: %s", e)
             return None
@@ -0,0 +1,117 @@
+"""
+Модуль для створення HTTP сесії з пулом з'єднань до Vkursi API
+"""
+import socket
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+try:
+    # urllib3 розпаковує br лише якщо встановлено brotli або brotlicffi
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        import brotlicffi  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Спільна для процесу сесія (створюється при першому виклику get_session)
+_SESSION: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _keepalive_socket_options() -> list:
+    """
+    Сформувати опції сокета для TCP keep-alive
+    
+    Returns:
+        Список опцій для urllib3 (TCP_KEEP* додаються лише якщо підтримуються ОС)
+    """
+    options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 30), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTP адаптер з TCP keep-alive, щоб балансувальник не закривав з'єднання з пулу"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        """Ініціалізувати пул з'єднань з опціями keep-alive"""
+        kwargs["socket_options"] = _keepalive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """
+    Створити HTTP сесію з пулом з'єднань та повторними спробами
+    
+    Сесія зберігає TCP/TLS з'єднання між запитами, тому авторизація та
+    подальші запити до API не виконують повторний handshake.
+    
+    Returns:
+        Налаштований об'єкт requests.Session
+    """
+    session = requests.Session()
+    
+    # Запити до API лише читають дані, тому POST також можна безпечно повторювати
+    retry = Retry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    
+    # Заголовки за замовчуванням для всіх запитів сесії
+    session.headers.update({
+        "Content-Type": "application/json",
+        # Стиснення відповіді: JSON з повторюваними ключами стискається в кілька разів
+        "Accept-Encoding": "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
+    })
+    
+    return session
+
+
+def _prewarm(session: requests.Session):
+    """
+    Відкрити з'єднання з API заздалегідь (DNS, TCP та TLS), щоб воно чекало в пулі
+    
+    Args:
+        session: Сесія, в пул якої потрапить з'єднання
+    """
+    try:
+        session.head(Config.BASE_URL, timeout=3, allow_redirects=False).close()
+    except requests.exceptions.RequestException:
+        # Прогрів не обов'язковий - перший запит відкриє з'єднання сам
+        pass
+
+
+def get_session() -> requests.Session:
+    """
+    Отримати спільну для процесу HTTP сесію
+    
+    При першому виклику сесія створюється і у фоновому потоці виконується
+    HEAD запит до API, тож поки програма готується до першого запиту,
+    з'єднання вже встановлюється.
+    
+    Returns:
+        Спільний об'єкт requests.Session (не закривається викликачами)
+    """
+    global _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            _SESSION = create_session()
+            threading.Thread(target=_prewarm, args=(_SESSION,), daemon=True).start()
+    return _SESSION
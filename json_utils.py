@@ -0,0 +1,135 @@
+"""
+Модуль для швидкої роботи з JSON
+Використовує orjson, якщо він встановлений, інакше стандартний модуль json
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Tuple, Union
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Розпарсити JSON
+    
+    Args:
+        data: JSON у вигляді bytes або str
+    
+    Returns:
+        Розпарсені дані
+    
+    Raises:
+        ValueError: Якщо дані не є коректним JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = True, sort_keys: bool = False) -> bytes:
+    """
+    Серіалізувати дані у JSON (UTF-8, без екранування кирилиці)
+    
+    Args:
+        obj: Дані для серіалізації
+        pretty: Форматувати з відступом у 2 пробіли
+        sort_keys: Сортувати ключі (однакові дані дають однакові bytes)
+    
+    Returns:
+        JSON у вигляді bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      sort_keys=sort_keys).encode('utf-8')
+
+
+def open_for_write(filepath: Union[str, Path], compress: bool = False) -> BinaryIO:
+    """
+    Відкрити файл для запису в бінарному режимі
+    
+    Args:
+        filepath: Шлях до файлу
+        compress: Стискати gzip (рівень 3 - швидко, а JSON стискається в рази)
+    
+    Returns:
+        Відкритий файловий об'єкт
+    """
+    if compress:
+        return gzip.open(filepath, 'wb', compresslevel=3)
+    # Великий буфер зменшує кількість системних викликів write()
+    return open(filepath, 'wb', buffering=1 << 20)
+
+
+def dump_to_file(obj: Any, filepath: Union[str, Path], pretty: bool = True,
+                 compress: bool = False):
+    """
+    Зберегти дані у JSON файл
+    
+    Args:
+        obj: Дані для збереження
+        filepath: Шлях до файлу
+        pretty: Форматувати з відступом у 2 пробіли
+        compress: Стиснути файл gzip
+    """
+    with open_for_write(filepath, compress) as f:
+        f.write(dumps(obj, pretty))
+
+
+def dump_fields_to_file(fields: Iterable[Tuple[str, Any]], filepath: Union[str, Path],
+                        pretty: bool = True, compress: bool = False):
+    """
+    Зберегти JSON об'єкт у файл, серіалізуючи його по одному полю
+    
+    Поля-списки записуються поелементно, тому повний JSON великого списку
+    не збирається в пам'яті. Значенням поля може бути й ітератор - він
+    записується як список. Результат збігається з dumps(dict(fields), pretty).
+    
+    Args:
+        fields: Пари (ключ, значення) у порядку запису
+        filepath: Шлях до файлу
+        pretty: Форматувати з відступом у 2 пробіли
+        compress: Стиснути файл gzip
+    """
+    # Відступи полів та елементів списку (при компактному записі - без відступів)
+    field_sep, item_sep, key_sep = (b"\n  ", b"\n    ", b": ") if pretty else (b"", b"", b":")
+    
+    def encode(value: Any, indent: bytes) -> bytes:
+        """Серіалізувати значення з відступом рівня, на якому воно записується"""
+        data = dumps(value, pretty)
+        return data.replace(b"\n", indent) if pretty else data
+    
+    with open_for_write(filepath, compress) as f:
+        f.write(b"{")
+        written = False
+        for key, value in fields:
+            f.write(b"," + field_sep if written else field_sep)
+            f.write(dumps(key, pretty=False) + key_sep)
+            written = True
+            
+            if not isinstance(value, (list, Iterator)):
+                f.write(encode(value, field_sep))
+                continue
+            
+            f.write(b"[")
+            index = -1
+            for index, item in enumerate(value):
+                f.write(b"," + item_sep if index else item_sep)
+                f.write(encode(item, item_sep))
+            # Порожній список записується як []
+            f.write(field_sep + b"]" if index >= 0 else b"]")
+        
+        f.write(b"\n}" if pretty and written else b"}")
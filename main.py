@@ -1,12 +1,15 @@
 """
 Основна програма для роботи з Vkursi API
 """
+import argparse
+import logging
 import sys
-from auth import VkursiAuth
+from pathlib import Path
+from auth import get_auth
 from bus_climate import HromadaAPI
 from hromada_economy import HromadaEconomyAPI
-from swot_processor import SWOTProcessor
-from config import Config
+from config import get_config
+from response_cache import ResponseCache
 
 
 def show_menu():
@@ -18,11 +21,12 @@ def show_menu():
     print("2. Отримати список громад (GetEconomyList)")
     print("3. Отримати SWOT звіт громади (getswot)")
     print("4. Обробити SWOT JSON файл (витягти статистику)")
+    print("5. Очистити кеш відповідей API")
     print("0. Вихід")
     print("=" * 50)
 
 
-def get_business_climate(token: str):
+def get_business_climate(hromada_api: HromadaAPI):
     """Функція для отримання даних бізнес-клімату"""
     print("\n--- Отримання даних бізнес-клімату ---")
     
@@ -41,7 +45,6 @@ def get_business_climate(token: str):
             print("\nОперацію перервано")
             return
     
-    hromada_api = HromadaAPI(token=token)
     climate_data = hromada_api.get_climate(year=year)
     
     if climate_data:
@@ -64,7 +67,7 @@ def get_business_climate(token: str):
         print("Помилка: не вдалося отримати дані бізнес-клімату")
 
 
-def get_economy_list(token: str):
+def get_economy_list(economy_api: HromadaEconomyAPI):
     """Функція для отримання списку громад"""
     print("\n--- Отримання списку громад (GetEconomyList) ---")
     
@@ -72,7 +75,6 @@ def get_economy_list(token: str):
     date_from = input("Введіть дату початку (YYYY-MM-DD або залиште пустим): ").strip()
     date_to = input("Введіть дату кінця (YYYY-MM-DD або залиште пустим): ").strip()
     
-    economy_api = HromadaEconomyAPI(token=token)
     economy_data = economy_api.get_economy_list(date_from=date_from, date_to=date_to)
     
     if economy_data:
@@ -100,20 +102,32 @@ def get_economy_list(token: str):
         print("Помилка: не вдалося отримати список громад")
 
 
-def get_swot_report(token: str):
+def get_swot_report(economy_api: HromadaEconomyAPI):
     """Функція для отримання SWOT звіту громади"""
     print("\n--- Отримання SWOT звіту громади (getswot) ---")
     
-    # Запитуємо register ID
-    register_id = input("Введіть Register ID громади: ").strip()
+    # Запитуємо register ID (кілька ID можна вказати через кому)
+    register_ids = [rid.strip() for rid in input("Введіть Register ID громади (кілька - через кому): ").split(",")]
+    register_ids = [rid for rid in register_ids if rid]
     
-    if not register_id:
+    if not register_ids:
         print("Помилка: Register ID не може бути порожнім")
         return
     
-    economy_api = HromadaEconomyAPI(token=token)
-    swot_data = economy_api.get_swot_report(register_id=register_id)
+    if len(register_ids) == 1:
+        swot_reports = {register_ids[0]: economy_api.get_swot_report(register_id=register_ids[0])}
+    else:
+        print(f"Отримання {len(register_ids)} SWOT звітів паралельно...")
+        swot_reports = economy_api.get_swot_reports_bulk(register_ids)
     
+    for register_id, swot_data in swot_reports.items():
+        if len(swot_reports) > 1:
+            print(f"\n=== Register ID: {register_id} ===")
+        show_swot_result(economy_api, register_id, swot_data)
+
+
+def show_swot_result(economy_api: HromadaEconomyAPI, register_id: str, swot_data):
+    """Вивести результат SWOT звіту та зберегти його у файл"""
     if swot_data:
         status_code = swot_data.get("status")
         success = swot_data.get("success", False)
@@ -138,14 +152,15 @@ def get_swot_report(token: str):
         print("Помилка: не вдалося отримати SWOT звіт")
 
 
-def process_swot_file():
+def process_swot_file(pretty: bool = False):
     """Функція для обробки SWOT JSON файлу"""
     print("\n--- Обробка SWOT JSON файлу ---")
     
-    # Запитуємо шлях до файлу
-    filepath = input("Введіть шлях до SWOT JSON файлу: ").strip()
+    # Запитуємо шлях до файлу (кілька файлів можна вказати через кому)
+    filepaths = [path.strip() for path in input("Введіть шлях до SWOT JSON файлу (кілька - через кому): ").split(",")]
+    filepaths = [path for path in filepaths if path]
     
-    if not filepath:
+    if not filepaths:
         print("Помилка: шлях до файлу не може бути порожнім")
         return
     
@@ -154,24 +169,60 @@ def process_swot_file():
     if not output_dir:
         output_dir = "output"
     
+    # swot_processor тягне за собою openpyxl, тому імпортуємо його лише тут
+    from swot_processor import SWOTProcessor
+    
     processor = SWOTProcessor()
-    result_file = processor.process_swot_file(filepath, output_dir)
+    if len(filepaths) > 1:
+        print(f"Обробка {len(filepaths)} файлів паралельно...")
+    results = processor.process_swot_files(filepaths, output_dir, pretty=pretty)
     
-    if result_file:
-        print(f"\nОбробка завершена успішно!")
-        print(f"Результат збережено: {result_file}")
-    else:
-        print("\nПомилка: не вдалося обробити файл")
+    for filepath, result_file in results.items():
+        if len(results) > 1:
+            print(f"\n=== {filepath} ===")
+        if result_file:
+            print(f"\nОбробка завершена успішно!")
+            print(f"Результат збережено: {result_file}")
+        else:
+            print("\nПомилка: не вдалося обробити файл")
+
+
+def clear_cache():
+    """Функція для очищення кешу відповідей API"""
+    for cache_name in (".climate_cache", ".economy_cache"):
+        ResponseCache(Path("output") / cache_name).clear()
+    print("\nКеш відповідей API очищено")
+
+
+def parse_args() -> argparse.Namespace:
+    """Розібрати аргументи командного рядка"""
+    parser = argparse.ArgumentParser(description="Vkursi API EPG - Python Client")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="не використовувати кеш відповідей API")
+    parser.add_argument("--pretty", action="store_true",
+                        help="зберігати статистику SWOT у JSON з відступами (для читання)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", dest="log_level", action="store_const",
+                           const=logging.DEBUG, default=logging.INFO,
+                           help="виводити також налагоджувальні повідомлення")
+    verbosity.add_argument("-q", "--quiet", dest="log_level", action="store_const",
+                           const=logging.WARNING,
+                           help="виводити лише попередження та помилки")
+    return parser.parse_args()
 
 
 def main():
     """Головна функція програми"""
+    args = parse_args()
+    logging.getLogger().setLevel(args.log_level)
+    use_cache = not args.no_cache
+    
     print("=" * 50)
     print("Vkursi API EPG - Python Client")
     print("=" * 50)
     
-    config = Config()
-    auth = VkursiAuth()
+    config = get_config()
+    auth = get_auth()
     
     # Перевіряємо наявність облікових даних
     email, password = config.get_credentials()
@@ -199,6 +250,10 @@ def main():
     
     print(f"Токен отримано: {token[:20]}...")
     
+    # Об'єкти API створюються один раз і використовуються в усіх пунктах меню
+    hromada_api = HromadaAPI(token=token, use_cache=use_cache, auth=auth)
+    economy_api = HromadaEconomyAPI(token=token, use_cache=use_cache, auth=auth)
+    
     # Головне меню
     while True:
         show_menu()
@@ -209,13 +264,15 @@ def main():
                 print("\nДо побачення!")
                 break
             elif choice == "1":
-                get_business_climate(token)
+                get_business_climate(hromada_api)
             elif choice == "2":
-                get_economy_list(token)
+                get_economy_list(economy_api)
             elif choice == "3":
-                get_swot_report(token)
+                get_swot_report(economy_api)
             elif choice == "4":
-                process_swot_file()
+                process_swot_file(pretty=args.pretty)
+            elif choice == "5":
+                clear_cache()
             else:
                 print("Помилка: невірний вибір. Спробуйте ще раз.")
                 
@@ -227,6 +284,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Повідомлення модулів API виводяться в консоль як і раніше
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,125 @@
+"""
+Модуль для кешування відповідей API на диску
+Зберігає тіло відповіді разом з ETag та терміном актуальності
+"""
+import logging
+import re
+import shelve
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Mapping, Union
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def max_age_from_headers(headers: Mapping[str, str]) -> Optional[int]:
+    """
+    Отримати термін актуальності відповіді із заголовка Cache-Control
+    
+    Args:
+        headers: Заголовки відповіді
+    
+    Returns:
+        Кількість секунд, 0 якщо кешувати заборонено, або None якщо заголовка немає
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if not cache_control:
+        return None
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+class ResponseCache:
+    """Кеш відповідей API на диску (shelve)"""
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Ініціалізація кешу
+        
+        Args:
+            path: Шлях до файлу кешу (директорія створюється автоматично)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Отримати запис з кешу
+        
+        Args:
+            key: Ключ запису
+        
+        Returns:
+            Словник з полями content, etag, stored_at, max_age або None
+        """
+        try:
+            with self._lock, shelve.open(str(self.path), flag="r") as db:
+                return db.get(key)
+        except Exception:
+            # Кеш ще не створено або він недоступний - працюємо без нього
+            return None
+    
+    def set(self, key: str, content: bytes, etag: Optional[str] = None, max_age: int = 0):
+        """
+        Зберегти відповідь у кеш
+        
+        Args:
+            key: Ключ запису
+            content: Тіло відповіді
+            etag: Значення заголовка ETag
+            max_age: Скільки секунд відповідь вважається актуальною без запиту до API
+        """
+        entry = {
+            "content": content,
+            "etag": etag,
+            "stored_at": time.time(),
+            "max_age": max_age
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, shelve.open(str(self.path)) as db:
+                db[key] = entry
+        except Exception as e:
+            log.warning("Попередження: не вдалося зберегти відповідь у кеш: %s", e)
+    
+    def touch(self, key: str, max_age: int):
+        """
+        Продовжити термін актуальності запису (після відповіді 304 Not Modified)
+        
+        Args:
+            key: Ключ запису
+            max_age: Новий термін актуальності в секундах
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.set(key, entry["content"], entry.get("etag"), max_age)
+    
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """
+        Перевірити чи запис ще актуальний
+        
+        Args:
+            entry: Запис кешу
+        
+        Returns:
+            True якщо термін актуальності не минув
+        """
+        return time.time() - entry["stored_at"] < entry["max_age"]
+    
+    def clear(self):
+        """Видалити всі записи з кешу"""
+        if not self.path.parent.exists():
+            return
+        try:
+            with self._lock, shelve.open(str(self.path)) as db:
+                db.clear()
+        except Exception as e:
+            log.error("Помилка очищення кешу: %s", e)
@@ -2,25 +2,485 @@
 Модуль для обробки JSON файлів отриманих від SWOT API
 Витягує та структурує статистику з SWOT звітів
 """
-import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import AbstractSet, Dict, Any, Optional, List, ClassVar, Set, Tuple, BinaryIO
 from datetime import datetime
+import logging
+import json_utils
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, Alignment, PatternFill
+    from openpyxl.utils import get_column_letter
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+if OPENPYXL_AVAILABLE:
+    # Стилі заголовків аркушів (один об'єкт стилю на всі клітинки заголовків)
+    _HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    _HEADER_FONT = Font(bold=True, color="FFFFFF")
+    _HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+
+# Поля SWOT звіту, з яких витягується статистика
+_SWOT_FIELDS = frozenset((
+    "kvedStatistic", "intelligenceStatistic", "migrationRegionStatistic",
+    "cadastrEstateStatistic", "statusStats", "openCloseStatistic", "vehicleStatistic"
+))
+
+# Розташування даних у SWOT файлі (префікси ijson) у порядку пріоритету
+_SWOT_ROOTS = ("data", "raw_response.Data", "raw_response.data")
+
+# Вкладені ключі полів, що не потрапляють у статистику: при потоковому розборі їх значення
+# не будуються (замінюються на null): {поле: (ключ, глибина у значенні поля або None - будь-яка)}
+_STREAM_SKIPPED = {
+    "cadastrEstateStatistic": ("cadastrNumbers", None),
+    "migrationRegionStatistic": ("list", 1),
+    "openCloseStatistic": ("list", 1)
+}
+
+# Розмір файлу, з якого SWOT JSON розбирається потоково (байти)
+_STREAM_MIN_SIZE = 32 * 1024 * 1024
+
+_NO_KEYS: frozenset = frozenset()
+
+_START_EVENTS = ("start_map", "start_array")
+_END_EVENTS = ("end_map", "end_array")
+
+
+class _FieldBuilder:
+    """Побудова значення одного поля з подій ijson з пропуском непотрібних ключів"""
+    
+    __slots__ = ("root", "field", "parent", "builder", "depth", "skip", "skip_key", "skip_depth")
+    
+    def __init__(self, root: str, field: str, parent: int):
+        """
+        Ініціалізація побудови
+        
+        Args:
+            root: Розташування даних, до якого належить поле
+            field: Назва поля
+            parent: Порядковий номер словника, що містить поле
+        """
+        self.root = root
+        self.field = field
+        self.parent = parent
+        self.builder = ijson.ObjectBuilder()
+        self.depth = 0
+        # Глибина всередині значення, що пропускається (0 - нічого не пропускаємо)
+        self.skip = 0
+        self.skip_key, self.skip_depth = _STREAM_SKIPPED.get(field, (None, None))
+    
+    def event(self, event: str, value: Any) -> bool:
+        """
+        Передати подію ijson
+        
+        Returns:
+            True, коли значення поля побудоване повністю
+        """
+        if self.skip:
+            if event in _START_EVENTS:
+                self.skip += 1
+            elif event in _END_EVENTS:
+                self.skip -= 1
+            # Пропущене значення закінчилось (скаляр або кінець контейнера)
+            if self.skip == 1 and event not in _START_EVENTS:
+                self.skip = 0
+            return False
+        
+        if (event == "map_key" and value == self.skip_key
+                and (self.skip_depth is None or self.depth == self.skip_depth)):
+            # Ключ залишаємо зі значенням null, щоб структура поля не змінилась
+            self.builder.event(event, value)
+            self.builder.event("null", None)
+            self.skip = 1
+            return False
+        
+        self.builder.event(event, value)
+        if event in _START_EVENTS:
+            self.depth += 1
+        elif event in _END_EVENTS:
+            self.depth -= 1
+        return self.depth == 0
+
+
+def _stream_swot_fields(f: BinaryIO) -> Dict[str, Any]:
+    """
+    Потоково розібрати SWOT JSON, побудувавши лише значення полів статистики
+    
+    Решта файлу лише проглядається і не створює об'єктів Python. Для кожного
+    поля обирається те ж входження, що й при обході в extract_statistics:
+    з першого в порядку обходу словника, де значення поля не null, крім
+    вкладених у словник, де це поле має значення null.
+    
+    Args:
+        f: Файл, відкритий у режимі 'rb'
+        
+    Returns:
+        Скорочений SWOT звіт {"data": {поле: значення}} або {} для порожнього файлу
+    """
+    # Префікси, за подіями яких визначається, чи документ і розташування даних непорожні
+    watched = {root: root for root in _SWOT_ROOTS}
+    watched.update((root + ".item", root) for root in _SWOT_ROOTS)
+    watched[""] = ""
+    non_empty = set()
+    
+    # Номери відкритих контейнерів (словники нумеруються в порядку появи, списки - 0)
+    open_containers: List[int] = []
+    map_count = 0
+    builders: List[_FieldBuilder] = []
+    # {(розташування, поле): (номер словника, значення)}
+    found: Dict[tuple, tuple] = {}
+    # Поля зі значенням null у відкритих словниках: {(розташування, поле): номер словника}
+    blocked: Dict[tuple, int] = {}
+    
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builders:
+            finished = False
+            for builder in builders:
+                finished |= builder.event(event, value)
+            if finished:
+                for builder in builders:
+                    if builder.depth:
+                        continue
+                    key = (builder.root, builder.field)
+                    best = found.get(key)
+                    field_value = builder.builder.value
+                    if field_value is None:
+                        # Словник ще відкритий, тож усі словники з більшим номером
+                        # вкладені в нього: знайдене в них входження не підходить
+                        if best is not None and best[0] > builder.parent:
+                            del found[key]
+                        blocked[key] = builder.parent
+                    elif best is None or builder.parent < best[0]:
+                        found[key] = (builder.parent, field_value)
+                builders = [builder for builder in builders if builder.depth]
+        
+        root = watched.get(prefix)
+        if root is not None:
+            if event == "map_key" or (root and prefix != root and event not in _END_EVENTS):
+                # Словник з ключем або список з елементом
+                non_empty.add(root)
+            elif root and event in ("string", "number", "boolean") and value:
+                non_empty.add(root)
+        
+        if event == "start_map":
+            map_count += 1
+            open_containers.append(map_count)
+        elif event == "start_array":
+            open_containers.append(0)
+        elif event in _END_EVENTS:
+            closed = open_containers.pop()
+            if blocked and closed:
+                for key in [key for key, number in blocked.items() if number == closed]:
+                    del blocked[key]
+        elif event == "map_key" and value in _SWOT_FIELDS:
+            for root in _SWOT_ROOTS:
+                if prefix == root or prefix.startswith(root + "."):
+                    best = found.get((root, value))
+                    parent = open_containers[-1]
+                    if (best is None or parent < best[0]) and (root, value) not in blocked:
+                        builders.append(_FieldBuilder(root, value, parent))
+                    break
+    
+    if "" not in non_empty:
+        return {}
+    for root in _SWOT_ROOTS:
+        if root in non_empty:
+            fields = {field: field_value for (field_root, field), (_, field_value)
+                      in found.items() if field_root == root}
+            if fields:
+                # Поля без входження записуємо як null, інакше пошук у скороченому
+                # звіті знайшов би їх копії всередині значень інших полів
+                for field in _SWOT_FIELDS:
+                    fields.setdefault(field, None)
+            return {"data": fields}
+    return {"data": {}}
+
+
+# Аркуші Excel з парами "Показник - Значення": (назва аркуша, ключ статистики, [(показник, поле)])
+_KV_SHEETS = (
+    ("Міграція", "migration_region_statistic", (
+        ("Міграція всього (вхід)", "migrationTotalIn"),
+        ("Міграція всього (вихід)", "migrationTotalOut"),
+        ("ФОП міграція (вхід)", "migrationTotalFopIn"),
+        ("ФОП міграція (вихід)", "migrationTotalFopOut"),
+        ("Компанії міграція (вхід)", "migrationTotalCompanyIn"),
+        ("Компанії міграція (вихід)", "migrationTotalCompanyOut")
+    )),
+    # У оригінальному SWOT файлі поля без пробілів
+    ("Відкриті_Закриті", "open_close_statistic", (
+        ("Компанії відкриті", "companyOpen"),
+        ("Компанії закриті", "companyCurrentClose"),
+        ("Компанії % живих", "companyPercentLive"),
+        ("ФОП відкриті", "fopOpen"),
+        ("ФОП закриті", "fopCurrentClose"),
+        ("ФОП % живих", "fopPercentLive"),
+        ("Всього відкриті", "totalOpen"),
+        ("Всього закриті", "totalCurrentClose"),
+        ("Всього % живих", "totalPercentLive")
+    )),
+    ("Транспорт", "vehicle_statistic", (
+        ("Компанії з транспортними засобами", "headerCompanyWithCount"),
+        ("Компанії без транспортних засобів", "headerCompanyWithoutCount"),
+        ("Всього транспортних засобів", "headerVehicleCount")
+    ))
+)
+
+# Аркуші кадастрової статистики: (назва аркуша, розріз cadastrEstateStatistic, назва першої колонки)
+_CADASTR_SHEETS = (
+    ("Кадастр_Власність", "byOwnerForm", "Тип власності"),
+    ("Кадастр_Призначення", "byPurpose", "Призначення")
+)
+
+
+# Підсумок обробки файлу: (назва, ключ статистики, виводити кількість записів замість Так/Ні)
+_SUMMARY_SPECS = (
+    ("КВЕД", "kved_statistic", True),
+    ("Інтелект", "intelligence_statistic", True),
+    ("Міграція", "migration_region_statistic", False),
+    ("Кадастр", "cadastr_estate_statistic", False),
+    ("Статуси", "status_stats", False),
+    ("Відкриті/Закриті", "open_close_statistic", False),
+    ("Транспорт", "vehicle_statistic", False)
+)
+
+
+def _write_sheet(wb: "Workbook", title: str, columns: List[str], rows: List[Tuple[Any, ...]]):
+    """
+    Створити аркуш із відформатованим рядком заголовків та рядками даних
+    
+    Ширина колонок підбирається за найдовшим значенням (не більше 50). У режимі
+    write_only ширину потрібно задати до запису першого рядка, тому рядки
+    передаються списком кортежів.
+    
+    Args:
+        wb: Робоча книга (write_only)
+        title: Назва аркуша
+        columns: Назви колонок
+        rows: Рядки даних
+    """
+    ws = wb.create_sheet(title)
+    
+    widths = [len(column) for column in columns]
+    for row in rows:
+        for i, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if length > widths[i]:
+                widths[i] = length
+    for i, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = min(width + 2, 50)
+    
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _HEADER_ALIGN
+        header.append(cell)
+    ws.append(header)
+    
+    append = ws.append
+    for row in rows:
+        append(row)
+
+
+def _index_first_occurrence(obj: Any, keys: AbstractSet[str]) -> Dict[str, Any]:
+    """
+    Знайти перше входження кожного з ключів у структурі за один обхід
+    
+    Обхід у глибину без рекурсії: у кожному словнику спершу перевіряються
+    його ключі, потім нащадки у вихідному порядку. Якщо в словнику ключ має
+    значення null, пошук цього ключа продовжується після словника, але не
+    всередині нього (як у рекурсивному пошуку, що повертав значення першого
+    словника з ключем). Обхід зупиняється, щойно знайдено всі ключі.
+    
+    Args:
+        obj: Словник, список або примітивне значення
+        keys: Ключі, які шукаємо
+        
+    Returns:
+        Словник {ключ: значення} для знайдених ключів
+    """
+    index: Dict[str, Any] = {}
+    # Елементи стека: (вузол, ключі зі значенням null у словниках-предках)
+    stack = [(obj, _NO_KEYS)]
+    while stack and len(index) < len(keys):
+        node, null_keys = stack.pop()
+        if isinstance(node, dict):
+            # Перевіряємо поточний рівень
+            child_null_keys = null_keys
+            for key, value in node.items():
+                if key in keys and key not in index and key not in null_keys:
+                    if value is not None:
+                        index[key] = value
+                    else:
+                        child_null_keys = child_null_keys | {key}
+            # Нащадків додаємо у зворотному порядку, щоб обходити їх у вихідному
+            stack.extend(zip(reversed(node.values()), repeat(child_null_keys)))
+        elif isinstance(node, list):
+            stack.extend(zip(reversed(node), repeat(null_keys)))
+    return index
+
+
+def _contains_key(obj: Any, target: str) -> bool:
+    """
+    Перевірити, чи є ключ у будь-якому словнику структури (до першого збігу)
+    
+    Args:
+        obj: Словник, список або примітивне значення
+        target: Ключ, який шукаємо
+        
+    Returns:
+        True якщо ключ знайдено
+    """
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if target in node:
+                return True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
+def _remove_cadastr_numbers(obj: Any) -> Any:
+    """
+    Отримати структуру без полів cadastrNumbers на всіх рівнях
+    
+    Копіюються лише контейнери на шляху до cadastrNumbers, решта піддерев
+    (і вся структура, якщо поля немає) повертається без копіювання. Обхід
+    виконується без рекурсії, тому глибина вкладеності не обмежена.
+    
+    Args:
+        obj: Словник, список або примітивне значення
+        
+    Returns:
+        Структура без cadastrNumbers (може містити об'єкти з obj)
+    """
+    if not _contains_key(obj, "cadastrNumbers"):
+        return obj
+    
+    # Обхід у зворотному порядку: контейнер обробляється після всіх нащадків
+    cleaned: Dict[int, Any] = {}
+    stack = [(obj, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            if isinstance(node, dict):
+                children = [value for key, value in node.items() if key != "cadastrNumbers"]
+            else:
+                children = node
+            stack.extend((child, False) for child in children if isinstance(child, (dict, list)))
+            continue
+        
+        # Копію створюємо лише якщо змінився сам контейнер або хоча б один нащадок
+        if isinstance(node, dict):
+            changed = "cadastrNumbers" in node
+            result = {}
+            for key, value in node.items():
+                if key != "cadastrNumbers":
+                    result[key] = new_value = cleaned.get(id(value), value)
+                    changed = changed or new_value is not value
+        else:
+            result = [cleaned.get(id(item), item) for item in node]
+            changed = any(new_item is not item for new_item, item in zip(result, node))
+        
+        if changed:
+            cleaned[id(node)] = result
+    
+    return cleaned.get(id(obj), obj)
+
+
+def _init_worker_logging(level: int):
+    """
+    Налаштувати вивід повідомлень у процесі-обробнику
+    
+    Процес, запущений через spawn (Windows, macOS), не успадковує налаштувань
+    logging головного процесу, тому без цього його повідомлення губляться.
+    
+    Args:
+        level: Рівень повідомлень модуля в головному процесі
+    """
+    if not logging.getLogger().handlers:
+        logging.basicConfig(format="%(message)s")
+    log.setLevel(level)
+
+
+def _process_swot_file(input_filepath: str, output_dir: str, pretty: bool) -> Optional[str]:
+    """
+    Обробити один SWOT файл у процесі-обробнику (для process_swot_files)
+    
+    Args:
+        input_filepath: Шлях до SWOT JSON файлу
+        output_dir: Директорія для збереження результату
+        pretty: Форматувати JSON зі статистикою з відступами
+        
+    Returns:
+        Шлях до збереженого файлу або None у разі помилки
+    """
+    return SWOTProcessor().process_swot_file(input_filepath, output_dir, pretty)
+
 
 class SWOTProcessor:
     """Клас для обробки SWOT JSON файлів"""
     
+    # Директорії, вже створені під час роботи програми
+    _ensured_dirs: ClassVar[Set[str]] = set()
+    
     def __init__(self):
         """Ініціалізація обробника SWOT файлів"""
         pass
     
+    def _ensure_output_dir(self, output_dir: str) -> Path:
+        """
+        Створити директорію для збереження файлів (лише при першому зверненні)
+        
+        Args:
+            output_dir: Директорія для збереження файлів
+            
+        Returns:
+            Шлях до директорії
+        """
+        output_path = Path(output_dir)
+        if output_dir not in self._ensured_dirs:
+            output_path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+        return output_path
+    
+    def _output_filepath(self, input_filepath: str, output_dir: str, now: datetime,
+                         extension: str) -> Path:
+        """
+        Сформувати шлях до файлу результату на основі імені вхідного файлу
+        
+        Args:
+            input_filepath: Шлях до вхідного SWOT файлу
+            output_dir: Директорія для збереження (створюється за потреби)
+            now: Час створення файлу
+            extension: Розширення файлу без крапки
+            
+        Returns:
+            Шлях виду <output_dir>/swot_statistics_<ім'я файлу>_<дата>.<розширення>
+        """
+        current_date = now.strftime("%Y-%m-%d_%H-%M-%S")
+        filename = f"swot_statistics_{Path(input_filepath).stem}_{current_date}.{extension}"
+        return self._ensure_output_dir(output_dir) / filename
+    
     def load_swot_file(self, filepath: str) -> Optional[Dict[str, Any]]:
         """
         Завантажити SWOT JSON файл
@@ -32,20 +492,58 @@ class SWOTProcessor:
             Словник з даними або None у разі помилки
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Читаємо bytes: orjson розбирає UTF-8 без попереднього декодування в str
+            with open(filepath, 'rb') as f:
+                data = json_utils.loads(f.read())
             return data
         except FileNotFoundError:
-            print(f"Помилка: файл не знайдено: {filepath}")
+            log.error("Помилка: файл не знайдено: %s", filepath)
             return None
-        except json.JSONDecodeError as e:
-            print(f"Помилка парсингу JSON: {e}")
+        except ValueError as e:
+            log.error("Помилка парсингу JSON: %s", e)
             return None
         except Exception as e:
-            print(f"Помилка завантаження файлу: {e}")
+            log.error("Помилка завантаження файлу: %s", e)
             return None
     
-    def extract_statistics(self, swot_data: Dict[str, Any]) -> Dict[str, Any]:
+    def load_swot_fields(self, filepath: str) -> Optional[Dict[str, Any]]:
+        """
+        Завантажити з SWOT JSON файлу лише поля, з яких витягується статистика
+        
+        Великі файли розбираються потоково (ijson), тому списки записів,
+        cadastrNumbers та інші непотрібні частини звіту не завантажуються в
+        пам'ять. Результат обробляється extract_statistics так само, як повний
+        звіт. Менші файли (або якщо ijson не встановлено) завантажуються повністю
+        через load_swot_file - розбір orjson швидший за потоковий.
+        
+        Args:
+            filepath: Шлях до JSON файлу
+            
+        Returns:
+            Скорочений SWOT звіт або None у разі помилки
+        """
+        try:
+            stream = IJSON_AVAILABLE and Path(filepath).stat().st_size >= _STREAM_MIN_SIZE
+        except OSError:
+            # Помилку доступу до файлу повідомить load_swot_file
+            stream = False
+        if not stream:
+            return self.load_swot_file(filepath)
+        
+        try:
+            with open(filepath, 'rb') as f:
+                return _stream_swot_fields(f)
+        except FileNotFoundError:
+            log.error("Помилка: файл не знайдено: %s", filepath)
+            return None
+        except ijson.JSONError as e:
+            log.error("Помилка парсингу JSON: %s", e)
+            return None
+        except Exception as e:
+            log.error("Помилка завантаження файлу: %s", e)
+            return None
+    
+    def extract_statistics(self, swot_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
         """
         Витягти статистику з SWOT даних
         
@@ -53,7 +551,7 @@ class SWOTProcessor:
             swot_data: Дані SWOT звіту
             
         Returns:
-            Словник з витягнутою статистикою
+            Кортеж (словник з витягнутою статистикою, множина знайдених в ньому ключів)
         """
         extracted = {
             "kved_statistic": [],
@@ -64,50 +562,37 @@ class SWOTProcessor:
             "open_close_statistic": {},
             "vehicle_statistic": {}
         }
+        # Ключі extracted, для яких знайдено непорожню статистику
+        found: Set[str] = set()
         
-        # Отримуємо дані з різних місць структури
-        data = swot_data.get("data") or swot_data.get("raw_response", {}).get("Data") or swot_data.get("raw_response", {}).get("data") or {}
+        # Отримуємо дані з різних місць структури (за пріоритетом: data, raw_response.Data, raw_response.data)
+        data = swot_data.get("data")
+        if not data and (raw_response := swot_data.get("raw_response")):
+            data = raw_response.get("Data") or raw_response.get("data")
         
         if not data:
-            print("Попередження: дані не знайдено в SWOT файлі")
-            return extracted
-        
-        # Рекурсивно шукаємо потрібні поля
-        def find_field(obj: Any, target_key: str, path: str = ""):
-            """Рекурсивно шукає поле в структурі"""
-            if isinstance(obj, dict):
-                # Перевіряємо поточний рівень
-                if target_key in obj:
-                    return obj[target_key]
-                
-                # Шукаємо в нащадках
-                for key, value in obj.items():
-                    result = find_field(value, target_key, f"{path}.{key}" if path else key)
-                    if result is not None:
-                        return result
-            
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    result = find_field(item, target_key, f"{path}[{i}]" if path else f"[{i}]")
-                    if result is not None:
-                        return result
-            
-            return None
+            log.warning("Попередження: дані не знайдено в SWOT файлі")
+            return extracted, found
+        
+        # Усі потрібні поля шукаємо за один обхід структури
+        fields = _index_first_occurrence(data, _SWOT_FIELDS)
         
         # Витягуємо kvedStatistic
-        kved_stat = find_field(data, "kvedStatistic")
+        kved_stat = fields.get("kvedStatistic")
         if kved_stat:
             extracted["kved_statistic"] = kved_stat
-            print(f"Знайдено {len(kved_stat)} записів КВЕД статистики")
+            found.add("kved_statistic")
+            log.info("Знайдено %d записів КВЕД статистики", len(kved_stat))
         
         # Витягуємо intelligenceStatistic
-        intel_stat = find_field(data, "intelligenceStatistic")
+        intel_stat = fields.get("intelligenceStatistic")
         if intel_stat:
             extracted["intelligence_statistic"] = intel_stat
-            print(f"Знайдено {len(intel_stat)} записів статистики інтелекту")
+            found.add("intelligence_statistic")
+            log.info("Знайдено %d записів статистики інтелекту", len(intel_stat))
         
         # Витягуємо migrationRegionStatistic (без list, лише загальні цифри)
-        migration_stat = find_field(data, "migrationRegionStatistic")
+        migration_stat = fields.get("migrationRegionStatistic")
         if migration_stat:
             # Копіюємо лише загальні показники, виключаючи list
             extracted["migration_region_statistic"] = {
@@ -118,39 +603,27 @@ class SWOTProcessor:
                 "migrationTotalCompanyIn": migration_stat.get("migrationTotalCompanyIn"),
                 "migrationTotalCompanyOut": migration_stat.get("migrationTotalCompanyOut")
             }
-            print("Знайдено статистику міграції (без списку дат)")
+            found.add("migration_region_statistic")
+            log.info("Знайдено статистику міграції (без списку дат)")
         
         # Витягуємо cadastrEstateStatistic (без cadastrNumbers)
-        cadastr_stat = find_field(data, "cadastrEstateStatistic")
+        cadastr_stat = fields.get("cadastrEstateStatistic")
         if cadastr_stat:
-            # Рекурсивно видаляємо cadastrNumbers з усіх рівнів
-            def remove_cadastr_numbers(obj: Any) -> Any:
-                """Рекурсивно видаляє cadastrNumbers з об'єкта"""
-                if isinstance(obj, dict):
-                    # Створюємо новий словник без cadastrNumbers
-                    cleaned = {}
-                    for key, value in obj.items():
-                        if key != "cadastrNumbers":
-                            cleaned[key] = remove_cadastr_numbers(value)
-                    return cleaned
-                elif isinstance(obj, list):
-                    # Обробляємо кожен елемент списку
-                    return [remove_cadastr_numbers(item) for item in obj]
-                else:
-                    # Примітивні типи повертаємо як є
-                    return obj
-            
-            extracted["cadastr_estate_statistic"] = remove_cadastr_numbers(cadastr_stat)
-            print("Знайдено статистику кадастрових земель (без cadastrNumbers)")
+            # Видаляємо cadastrNumbers з усіх рівнів
+            extracted["cadastr_estate_statistic"] = _remove_cadastr_numbers(cadastr_stat)
+            if extracted["cadastr_estate_statistic"]:
+                found.add("cadastr_estate_statistic")
+            log.info("Знайдено статистику кадастрових земель (без cadastrNumbers)")
         
         # Витягуємо statusStats
-        status_stats = find_field(data, "statusStats")
+        status_stats = fields.get("statusStats")
         if status_stats:
             extracted["status_stats"] = status_stats
-            print("Знайдено статистику статусів")
+            found.add("status_stats")
+            log.info("Знайдено статистику статусів")
         
         # Витягуємо openCloseStatistic (без list, лише загальні цифри)
-        open_close_stat = find_field(data, "openCloseStatistic")
+        open_close_stat = fields.get("openCloseStatistic")
         if open_close_stat:
             # Копіюємо лише загальні показники, виключаючи list
             # У оригінальному SWOT файлі поля без пробілів: companyOpen, fopOpen, тощо
@@ -165,33 +638,36 @@ class SWOTProcessor:
                 "totalCurrentClose": open_close_stat.get("totalCurrentClose"),
                 "totalPercentLive": open_close_stat.get("totalPercentLive")
             }
+            found.add("open_close_statistic")
             # Перевіряємо чи є хоча б одне не-null значення
             has_values = any(v is not None for v in extracted["open_close_statistic"].values())
             if has_values:
-                print("Знайдено статистику відкритих/закритих компаній (без списку)")
+                log.info("Знайдено статистику відкритих/закритих компаній (без списку)")
             else:
-                print("Знайдено поле openCloseStatistic, але всі значення null")
+                log.info("Знайдено поле openCloseStatistic, але всі значення null")
         
         # Витягуємо vehicleStatistic
-        vehicle_stat = find_field(data, "vehicleStatistic")
+        vehicle_stat = fields.get("vehicleStatistic")
         if vehicle_stat:
             extracted["vehicle_statistic"] = {
                 "headerCompanyWithCount": vehicle_stat.get("headerCompanyWithCount"),
                 "headerCompanyWithoutCount": vehicle_stat.get("headerCompanyWithoutCount"),
                 "headerVehicleCount": vehicle_stat.get("headerVehicleCount")
             }
+            found.add("vehicle_statistic")
             # Перевіряємо чи є хоча б одне не-null значення
             has_values = any(v is not None for v in extracted["vehicle_statistic"].values())
             if has_values:
-                print("Знайдено статистику транспортних засобів")
+                log.info("Знайдено статистику транспортних засобів")
             else:
-                print("Знайдено поле vehicleStatistic, але всі значення null")
+                log.info("Знайдено поле vehicleStatistic, але всі значення null")
         
-        return extracted
+        return extracted, found
     
     def save_extracted_statistics(self, statistics: Dict[str, Any], 
                                   input_filepath: str,
-                                  output_dir: str = "output") -> Optional[str]:
+                                  output_dir: str = "output",
+                                  pretty: bool = False) -> Optional[str]:
         """
         Зберегти витягнуту статистику у структурований JSON файл
         
@@ -199,42 +675,36 @@ class SWOTProcessor:
             statistics: Витягнута статистика
             input_filepath: Шлях до вхідного SWOT файлу
             output_dir: Директорія для збереження (за замовчуванням "output")
+            pretty: Форматувати JSON з відступами (за замовчуванням компактний запис)
             
         Returns:
             Шлях до збереженого файлу або None у разі помилки
         """
         try:
-            # Створюємо директорію якщо вона не існує
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
-            
-            # Формуємо ім'я файлу на основі вхідного файлу
-            input_file = Path(input_filepath)
-            input_stem = input_file.stem
-            current_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"swot_statistics_{input_stem}_{current_date}.json"
-            filepath = output_path / filename
+            # Один момент часу для імені файлу та всіх полів метаданих
+            now = datetime.now()
+            filepath = self._output_filepath(input_filepath, output_dir, now, "json")
             
             # Створюємо структурований JSON з метаданими
+            date_created = now.strftime("%Y-%m-%d %H:%M:%S")
             structured_data = {
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "date_created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "created_at": now.isoformat(),
+                    "date_created": date_created,
                     "source_file": str(input_filepath),
-                    "description": f"Витягнута статистика з SWOT звіту. Файл створено {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    "description": f"Витягнута статистика з SWOT звіту. Файл створено {date_created}"
                 },
                 "statistics": statistics
             }
             
-            # Зберігаємо у JSON файл з красивим форматуванням
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, ensure_ascii=False, indent=2)
+            # Відступи потрібні лише для читання файлу людиною
+            json_utils.dump_to_file(structured_data, filepath, pretty)
             
-            print(f"\nСтатистика збережена у файл: {filepath}")
+            log.info("Статистика збережена у файл: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            print(f"Помилка збереження статистики: {e}")
+            log.error("Помилка збереження статистики: %s", e)
             return None
     
     def save_statistics_to_excel(self, statistics: Dict[str, Any],
@@ -252,381 +722,168 @@ class SWOTProcessor:
             Шлях до збереженого Excel файлу або None у разі помилки
         """
         if not OPENPYXL_AVAILABLE:
-            print("Попередження: openpyxl не встановлено. Excel файл не буде створено.")
-            print("Встановіть: pip install openpyxl")
+            log.warning("Попередження: openpyxl не встановлено. Excel файл не буде створено. "
+                        "Встановіть: pip install openpyxl")
             return None
         
         try:
-            # Створюємо директорію якщо вона не існує
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
-            
-            # Формуємо ім'я файлу
-            input_file = Path(input_filepath)
-            input_stem = input_file.stem
-            current_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"swot_statistics_{input_stem}_{current_date}.xlsx"
-            filepath = output_path / filename
-            
-            # Створюємо нову робочу книгу
-            wb = Workbook()
+            filepath = self._output_filepath(input_filepath, output_dir, datetime.now(), "xlsx")
             
-            # Видаляємо стандартний аркуш
-            if "Sheet" in wb.sheetnames:
-                wb.remove(wb["Sheet"])
-            
-            # Стилі для заголовків
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
+            # Робоча книга в режимі write_only: рядки одразу записуються у файл
+            # і не зберігаються в пам'яті як об'єкти клітинок
+            wb = Workbook(write_only=True)
             
             # 1. КВЕД статистика
             if statistics.get("kved_statistic"):
-                ws_kved = wb.create_sheet("КВЕД")
-                ws_kved.append(["КВЕД ID", "Назва", "Кількість записів"])
-                for row in ws_kved.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                for item in statistics["kved_statistic"]:
-                    ws_kved.append([
-                        item.get("kvedId", ""),
-                        item.get("name", ""),
-                        item.get("qntRecord", 0)
-                    ])
-                
-                # Автопідбір ширини колонок
-                for column in ws_kved.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_kved.column_dimensions[column_letter].width = adjusted_width
+                _write_sheet(wb, "КВЕД", ["КВЕД ID", "Назва", "Кількість записів"], [
+                    (item.get("kvedId", ""), item.get("name", ""), item.get("qntRecord", 0))
+                    for item in statistics["kved_statistic"]
+                ])
             
             # 2. Статистика інтелекту (стани)
             if statistics.get("intelligence_statistic"):
-                ws_intel = wb.create_sheet("Стани реєстрації")
-                ws_intel.append(["Стан", "Кількість записів"])
-                for row in ws_intel.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                for item in statistics["intelligence_statistic"]:
-                    ws_intel.append([
-                        item.get("state", ""),
-                        item.get("qntRecord", 0)
-                    ])
-                
-                for column in ws_intel.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_intel.column_dimensions[column_letter].width = adjusted_width
-            
-            # 3. Статистика міграції
-            if statistics.get("migration_region_statistic"):
-                ws_migration = wb.create_sheet("Міграція")
-                migration_stat = statistics["migration_region_statistic"]
-                ws_migration.append(["Показник", "Значення"])
-                for row in ws_migration.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                ws_migration.append(["Міграція всього (вхід)", migration_stat.get("migrationTotalIn", 0)])
-                ws_migration.append(["Міграція всього (вихід)", migration_stat.get("migrationTotalOut", 0)])
-                ws_migration.append(["ФОП міграція (вхід)", migration_stat.get("migrationTotalFopIn", 0)])
-                ws_migration.append(["ФОП міграція (вихід)", migration_stat.get("migrationTotalFopOut", 0)])
-                ws_migration.append(["Компанії міграція (вхід)", migration_stat.get("migrationTotalCompanyIn", 0)])
-                ws_migration.append(["Компанії міграція (вихід)", migration_stat.get("migrationTotalCompanyOut", 0)])
-                
-                for column in ws_migration.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_migration.column_dimensions[column_letter].width = adjusted_width
-            
-            # 4. Статистика відкритих/закритих
-            open_close_stat = statistics.get("open_close_statistic", {})
-            if open_close_stat:
-                ws_open_close = wb.create_sheet("Відкриті_Закриті")
-                ws_open_close.append(["Показник", "Значення"])
-                for row in ws_open_close.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Витягуємо значення, замінюючи None на 0
-                # У оригінальному SWOT файлі поля без пробілів
-                company_open = open_close_stat.get("companyOpen") if open_close_stat.get("companyOpen") is not None else 0
-                company_close = open_close_stat.get("companyCurrentClose") if open_close_stat.get("companyCurrentClose") is not None else 0
-                company_percent = open_close_stat.get("companyPercentLive") if open_close_stat.get("companyPercentLive") is not None else 0
-                fop_open = open_close_stat.get("fopOpen") if open_close_stat.get("fopOpen") is not None else 0
-                fop_close = open_close_stat.get("fopCurrentClose") if open_close_stat.get("fopCurrentClose") is not None else 0
-                fop_percent = open_close_stat.get("fopPercentLive") if open_close_stat.get("fopPercentLive") is not None else 0
-                total_open = open_close_stat.get("totalOpen") if open_close_stat.get("totalOpen") is not None else 0
-                total_close = open_close_stat.get("totalCurrentClose") if open_close_stat.get("totalCurrentClose") is not None else 0
-                total_percent = open_close_stat.get("totalPercentLive") if open_close_stat.get("totalPercentLive") is not None else 0
-                
-                ws_open_close.append(["Компанії відкриті", company_open])
-                ws_open_close.append(["Компанії закриті", company_close])
-                ws_open_close.append(["Компанії % живих", company_percent])
-                ws_open_close.append(["ФОП відкриті", fop_open])
-                ws_open_close.append(["ФОП закриті", fop_close])
-                ws_open_close.append(["ФОП % живих", fop_percent])
-                ws_open_close.append(["Всього відкриті", total_open])
-                ws_open_close.append(["Всього закриті", total_close])
-                ws_open_close.append(["Всього % живих", total_percent])
-                
-                for column in ws_open_close.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_open_close.column_dimensions[column_letter].width = adjusted_width
+                _write_sheet(wb, "Стани реєстрації", ["Стан", "Кількість записів"], [
+                    (item.get("state", ""), item.get("qntRecord", 0))
+                    for item in statistics["intelligence_statistic"]
+                ])
             
-            # 5. Статистика транспортних засобів
-            vehicle_stat = statistics.get("vehicle_statistic", {})
-            if vehicle_stat:
-                ws_vehicle = wb.create_sheet("Транспорт")
-                ws_vehicle.append(["Показник", "Значення"])
-                for row in ws_vehicle.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Витягуємо значення, замінюючи None на 0
-                company_with = vehicle_stat.get("headerCompanyWithCount") if vehicle_stat.get("headerCompanyWithCount") is not None else 0
-                company_without = vehicle_stat.get("headerCompanyWithoutCount") if vehicle_stat.get("headerCompanyWithoutCount") is not None else 0
-                vehicle_count = vehicle_stat.get("headerVehicleCount") if vehicle_stat.get("headerVehicleCount") is not None else 0
-                
-                ws_vehicle.append(["Компанії з транспортними засобами", company_with])
-                ws_vehicle.append(["Компанії без транспортних засобів", company_without])
-                ws_vehicle.append(["Всього транспортних засобів", vehicle_count])
-                
-                for column in ws_vehicle.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_vehicle.column_dimensions[column_letter].width = adjusted_width
+            # 3-5. Аркуші "Показник - Значення" (міграція, відкриті/закриті, транспорт)
+            for sheet_name, stat_key, fields in _KV_SHEETS:
+                stat = statistics.get(stat_key)
+                if not stat:
+                    continue
+                rows = []
+                for label, key in fields:
+                    # Відсутні значення (null) записуємо як 0
+                    value = stat.get(key)
+                    rows.append((label, value if value is not None else 0))
+                _write_sheet(wb, sheet_name, ["Показник", "Значення"], rows)
             
-            # 6. Статистика кадастрових земель (byOwnerForm)
+            # 6. Статистика кадастрових земель (byOwnerForm та byPurpose)
             cadastr_stat = statistics.get("cadastr_estate_statistic", {})
-            by_owner = cadastr_stat.get("byOwnerForm", {})
-            if by_owner:
-                ws_cadastr = wb.create_sheet("Кадастр_Власність")
-                ws_cadastr.append(["Тип власності", "Кількість", "Площа", "Ціна НГО"])
-                for row in ws_cadastr.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Додаємо загальну статистику
-                total = by_owner.get("totalStat", {})
-                if total:
-                    ws_cadastr.append([
-                        total.get("name", "Всього"),
-                        total.get("count", 0),
-                        total.get("area", 0),
-                        total.get("ngoPrice", 0)
-                    ])
-                
-                # Додаємо статистику за типами власності
-                stat_list = by_owner.get("statistic", [])
-                for item in stat_list:
-                    ws_cadastr.append([
-                        item.get("name", ""),
-                        item.get("count", 0),
-                        item.get("area", 0),
-                        item.get("ngoPrice", 0) or 0
-                    ])
-                
-                for column in ws_cadastr.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_cadastr.column_dimensions[column_letter].width = adjusted_width
-            
-            # 6. Статистика кадастрових земель (byPurpose)
-            by_purpose = cadastr_stat.get("byPurpose", {})
-            if by_purpose:
-                ws_purpose = wb.create_sheet("Кадастр_Призначення")
-                ws_purpose.append(["Призначення", "Кількість", "Площа", "Ціна НГО"])
-                for row in ws_purpose.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
+            for sheet_name, stat_key, name_column in _CADASTR_SHEETS:
+                cadastr_part = cadastr_stat.get(stat_key, {})
+                if not cadastr_part:
+                    continue
+                rows = []
                 
                 # Додаємо загальну статистику
-                total = by_purpose.get("totalStat", {})
+                total = cadastr_part.get("totalStat", {})
                 if total:
-                    ws_purpose.append([
+                    rows.append((
                         total.get("name", "Всього"),
                         total.get("count", 0),
                         total.get("area", 0),
                         total.get("ngoPrice", 0)
-                    ])
+                    ))
                 
-                # Додаємо статистику за призначенням
-                stat_list = by_purpose.get("statistic", [])
-                for item in stat_list:
-                    ws_purpose.append([
+                # Додаємо статистику за типами власності / призначенням
+                append = rows.append
+                for item in cadastr_part.get("statistic", []):
+                    append((
                         item.get("name", ""),
                         item.get("count", 0),
                         item.get("area", 0),
                         item.get("ngoPrice", 0) or 0
-                    ])
+                    ))
                 
-                for column in ws_purpose.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_purpose.column_dimensions[column_letter].width = adjusted_width
+                _write_sheet(wb, sheet_name, [name_column, "Кількість", "Площа", "Ціна НГО"], rows)
             
             # 7. Статистика статусів (landStat та objectStat)
             status_stats = statistics.get("status_stats", {})
             if status_stats:
-                ws_status = wb.create_sheet("Статуси")
-                ws_status.append(["Статус", "Земельні ділянки", "Об'єкти"])
-                for row in ws_status.iter_rows(min_row=1, max_row=1):
-                    for cell in row:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                
                 land_stat = status_stats.get("landStat", {})
                 object_stat = status_stats.get("objectStat", {})
                 
                 # Збираємо всі унікальні ключі
                 all_keys = set(land_stat.keys()) | set(object_stat.keys())
                 
-                for key in sorted(all_keys):
-                    ws_status.append([
-                        key,
-                        land_stat.get(key, 0),
-                        object_stat.get(key, 0)
-                    ])
-                
-                for column in ws_status.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws_status.column_dimensions[column_letter].width = adjusted_width
+                _write_sheet(wb, "Статуси", ["Статус", "Земельні ділянки", "Об'єкти"], [
+                    (key, land_stat.get(key, 0), object_stat.get(key, 0))
+                    for key in sorted(all_keys)
+                ])
             
             # Зберігаємо файл
             wb.save(filepath)
-            print(f"Excel файл збережено: {filepath}")
+            log.info("Excel файл збережено: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            print(f"Помилка створення Excel файлу: {e}")
+            log.error("Помилка створення Excel файлу: %s", e)
             return None
     
     def process_swot_file(self, input_filepath: str, 
-                         output_dir: str = "output") -> Optional[str]:
+                         output_dir: str = "output",
+                         pretty: bool = False) -> Optional[str]:
         """
         Обробити SWOT файл: завантажити, витягти статистику та зберегти
         
         Args:
             input_filepath: Шлях до SWOT JSON файлу
             output_dir: Директорія для збереження результату
+            pretty: Форматувати JSON зі статистикою з відступами
             
         Returns:
             Шлях до збереженого файлу або None у разі помилки
         """
-        print(f"\nОбробка SWOT файлу: {input_filepath}")
-        print("=" * 60)
+        log.info("Обробка SWOT файлу: %s", input_filepath)
+        log.debug("=" * 60)
         
         # Завантажуємо файл
-        swot_data = self.load_swot_file(input_filepath)
+        swot_data = self.load_swot_fields(input_filepath)
         if not swot_data:
             return None
         
         # Витягуємо статистику
-        print("\nВитягування статистики...")
-        statistics = self.extract_statistics(swot_data)
+        log.info("Витягування статистики...")
+        statistics, found = self.extract_statistics(swot_data)
         
         # Перевіряємо чи щось знайдено
-        has_data = any([
-            statistics["kved_statistic"],
-            statistics["intelligence_statistic"],
-            statistics["migration_region_statistic"],
-            statistics["cadastr_estate_statistic"],
-            statistics["status_stats"],
-            statistics["open_close_statistic"],
-            statistics["vehicle_statistic"]
-        ])
-        
-        if not has_data:
-            print("Попередження: не знайдено жодної статистики у файлі")
+        if not found:
+            log.warning("Попередження: не знайдено жодної статистики у файлі")
         else:
-            print(f"\nВитягнуто статистику:")
-            print(f"  - КВЕД: {len(statistics['kved_statistic'])} записів")
-            print(f"  - Інтелект: {len(statistics['intelligence_statistic'])} записів")
-            print(f"  - Міграція: {'Так' if statistics['migration_region_statistic'] else 'Ні'}")
-            print(f"  - Кадастр: {'Так' if statistics['cadastr_estate_statistic'] else 'Ні'}")
-            print(f"  - Статуси: {'Так' if statistics['status_stats'] else 'Ні'}")
-            print(f"  - Відкриті/Закриті: {'Так' if statistics['open_close_statistic'] else 'Ні'}")
-            print(f"  - Транспорт: {'Так' if statistics['vehicle_statistic'] else 'Ні'}")
+            log.info("Витягнуто статистику:")
+            for label, key, counted in _SUMMARY_SPECS:
+                if counted:
+                    log.info("  - %s: %d записів", label, len(statistics[key]))
+                else:
+                    log.info("  - %s: %s", label, "Так" if key in found else "Ні")
         
         # Зберігаємо результат у JSON
-        json_file = self.save_extracted_statistics(statistics, input_filepath, output_dir)
+        json_file = self.save_extracted_statistics(statistics, input_filepath, output_dir, pretty)
         
         # Зберігаємо результат у Excel
         excel_file = self.save_statistics_to_excel(statistics, input_filepath, output_dir)
         
         return json_file if json_file else excel_file
+    
+    def process_swot_files(self, input_filepaths: List[str], output_dir: str = "output",
+                           workers: Optional[int] = None,
+                           pretty: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Обробити кілька SWOT файлів паралельно в окремих процесах
+        
+        Розбір JSON та запис Excel навантажують процесор, тому файли
+        обробляються в пулі процесів, а не потоків. Викликати з блоку
+        if __name__ == "__main__" (процеси-обробники імпортують головний модуль).
+        
+        Args:
+            input_filepaths: Шляхи до SWOT JSON файлів
+            output_dir: Директорія для збереження результатів
+            workers: Кількість процесів (None - за кількістю ядер процесора)
+            pretty: Форматувати JSON зі статистикою з відступами
+            
+        Returns:
+            Словник {шлях до SWOT файлу: шлях до збереженого файлу або None}
+        """
+        # Прибираємо дублікати, зберігаючи порядок
+        input_filepaths = list(dict.fromkeys(input_filepaths))
+        if len(input_filepaths) <= 1:
+            return {filepath: self.process_swot_file(filepath, output_dir, pretty)
+                    for filepath in input_filepaths}
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_logging,
+                                 initargs=(log.getEffectiveLevel(),)) as executor:
+            results = executor.map(_process_swot_file, input_filepaths,
+                                   repeat(output_dir), repeat(pretty))
+            return dict(zip(input_filepaths, results))